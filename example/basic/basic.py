@@ -5,11 +5,12 @@ from kptn.runner import cli_parser, parse_and_validate_tasks
 from kptn.util.pipeline_config import PipelineConfig
 
 
-VALID_TASKS: set[str] = { "a", "b", "c" }
+VALID_TASKS: frozenset[str] = frozenset({ "a", "b", "c" })
+TASKS_CONFIG_PATH = str(Path(__file__).parent / "kptn.yaml")
 
 def basic(task_list: list[str] = [], ignore_cache: bool = False):
     pipeline_config = PipelineConfig(
-        TASKS_CONFIG_PATH=str(Path(__file__).parent / "kptn.yaml"),
+        TASKS_CONFIG_PATH=TASKS_CONFIG_PATH,
         PIPELINE_NAME="basic",
     )
 
@@ -17,7 +18,7 @@ def basic(task_list: list[str] = [], ignore_cache: bool = False):
 
     opts = (
         pipeline_config,
-        set(task_list),
+        frozenset(task_list),
         ignore_cache,
     )
 
@@ -7,11 +7,12 @@ from kptn.util.pipeline_config import PipelineConfig
 
 os.environ["KPTN_FLOW_TYPE"] = "vanilla"
 
-VALID_TASKS: set[str] = { "raw_numbers", "fruit_metrics", "fruit_summary", "wide_table", "python_source", "python_consumer" }
+VALID_TASKS: frozenset[str] = frozenset({ "raw_numbers", "fruit_metrics", "fruit_summary", "wide_table", "python_source", "python_consumer" })
+TASKS_CONFIG_PATH = str(Path(__file__).parent / "kptn.yaml")
 
 def duckdb_example(task_list: list[str] = [], ignore_cache: bool = False):
     pipeline_config = PipelineConfig(
-        TASKS_CONFIG_PATH=str(Path(__file__).parent / "kptn.yaml"),
+        TASKS_CONFIG_PATH=TASKS_CONFIG_PATH,
         PIPELINE_NAME="duckdb_example",
     )
 
@@ -19,7 +20,7 @@ def duckdb_example(task_list: list[str] = [], ignore_cache: bool = False):
 
     opts = (
         pipeline_config,
-        set(task_list),
+        frozenset(task_list),
         ignore_cache,
     )
 
@@ -10,8 +10,9 @@ from kptn.util.pipeline_config import PipelineConfig, get_storage_key
 
 # Add the tasks directory to sys.path to enable imports
 tasks_path = Path(__file__).parent / "../py_tasks"
-if tasks_path.parent not in [Path(p) for p in sys.path]:
-    sys.path.insert(0, str(tasks_path.parent))
+tasks_parent = str(tasks_path.parent)
+if tasks_parent not in sys.path:
+    sys.path.insert(0, tasks_parent)
 import py_tasks as tasks
 
 from kptn.caching.TaskStateCache import run_task
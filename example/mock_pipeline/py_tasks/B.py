@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from kptn.util.pipeline_config import PipelineConfig
 
@@ -5,7 +6,12 @@ from kptn.util.pipeline_config import PipelineConfig
 def B(pipeline_config: PipelineConfig):
     input_file = Path(pipeline_config.scratch_dir) / "A" / "A_2024.csv"
     output_file = Path(pipeline_config.scratch_dir) / "B" / "B_2024.csv"
-    input_data = input_file.read_text()
+    input_data = input_file.read_bytes()
     output_file.parent.mkdir(parents=True, exist_ok=True)
-    output_file.write_text(input_data + "B")
+    # Write beside the target and swap it in so E never reads a partial file
+    tmp_file = output_file.with_suffix(".tmp")
+    with open(tmp_file, "wb") as f:
+        f.write(input_data)
+        f.write(b"B")
+    os.replace(tmp_file, output_file)
     print("Wrote", output_file)
@@ -7,9 +7,10 @@ def subtask_process(pipeline_config: PipelineConfig, item: str) -> list[str]:
     - On first run of T1, fail to simulate a partial mapped task failure
     - Succeed on the second run
     """
-    output_dir = Path(pipeline_config.scratch_dir) / "subtask_process"
-    output_dir.mkdir(parents=True, exist_ok=True)
     if item == "T1":
+        # Only the T1 item writes, so the other items skip the mkdir syscall
+        output_dir = Path(pipeline_config.scratch_dir) / "subtask_process"
+        output_dir.mkdir(parents=True, exist_ok=True)
         output_file = output_dir / "T1.txt"
         if output_file.exists():
             pass
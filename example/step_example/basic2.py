@@ -7,11 +7,12 @@ from kptn.util.pipeline_config import PipelineConfig
 
 os.environ["KPTN_FLOW_TYPE"] = "vanilla"
 
-VALID_TASKS: set[str] = { "a", "b" }
+VALID_TASKS: frozenset[str] = frozenset({ "a", "b" })
+TASKS_CONFIG_PATH = str(Path(__file__).parent / "kptn.yaml")
 
 def basic2(task_list: list[str] = [], ignore_cache: bool = False):
     pipeline_config = PipelineConfig(
-        TASKS_CONFIG_PATH=str(Path(__file__).parent / "kptn.yaml"),
+        TASKS_CONFIG_PATH=TASKS_CONFIG_PATH,
         PIPELINE_NAME="basic2",
     )
 
@@ -19,7 +20,7 @@ def basic2(task_list: list[str] = [], ignore_cache: bool = False):
 
     opts = (
         pipeline_config,
-        set(task_list),
+        frozenset(task_list),
         ignore_cache,
     )
 
@@ -1,10 +1,14 @@
 import os
 import logging
+from urllib.parse import urlsplit
 import requests
 import prefect.settings
 
 logger = logging.getLogger(__name__)
 
+# Reused across calls so repeated credential fetches keep the connection alive
+_session = requests.Session()
+
 """
 This module contains functions to get AWS credentials from the Prefect API URL.
 """
@@ -24,13 +28,15 @@ def get_prefect_api_url():
 
 def get_ip_from_prefect_url(url):
     """Get the IP address from the URL."""
-    ip = url.split("//")[1].split(":")[0]
+    ip = urlsplit(url).hostname
+    if not ip:
+        raise ValueError(f"No host found in Prefect API URL: {url}")
     logger.debug(f"IP: {ip}")
     return ip
 
 def get_creds(ip, port=8080):
     """Get credentials and bucket name from the NGINX server."""
-    resp = requests.get(f"http://{ip}:{port}")
+    resp = _session.get(f"http://{ip}:{port}")
     resp_json = resp.json()
     resp_json['ExternalsBucket'] = resp.headers.get("X-AWS-Externals-Bucket")
     resp_json['ArtifactsBucket'] = resp.headers.get("X-AWS-Artifacts-Bucket")
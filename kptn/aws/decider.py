@@ -102,6 +102,8 @@ def decide_task_execution(
     if execution_mode:
         response["execution_mode"] = execution_mode
 
+    # The task runs in its own container, so this (possibly warm) Lambda never finalizes it
+    tscache.release_dep_states(task_name)
     return response
 
 
@@ -2,13 +2,15 @@ import ast
 import glob
 import hashlib
 import logging
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from string import Template
-from typing import TYPE_CHECKING, Any, Iterable
+from typing import TYPE_CHECKING, Any, Callable, Iterable
 
-from kptn.caching.r_imports import get_file_list, hash_r_files
+from kptn.caching.r_imports import get_file_list, hash_r_file_list
 from kptn.util.hash import hash_file, hash_obj
 from kptn.util.logger import get_logger
 from kptn.util.pipeline_config import PipelineConfig
@@ -20,10 +22,31 @@ if TYPE_CHECKING:  # pragma: no cover - only for static typing
 
 logger = get_logger()
 var_pattern = re.compile(r"\$\{([a-zA-Z0-9\-_\.]+)\}")
+# Splits source the way the Python parser does (not on form feeds), matching AST line numbers
+source_line_pattern = re.compile(r"[^\r\n]*(?:\r\n|\r|\n)|[^\r\n]+$")
 
 DUCKDB_OUTPUT_PREFIX = "duckdb://"
 DUCKDB_EMPTY_SENTINEL = "duckdb-empty-table"
 DUCKDB_EMPTY_HASH = hashlib.md5(DUCKDB_EMPTY_SENTINEL.encode()).hexdigest()
+# hashlib releases the GIL while digesting, so output files are hashed on a few threads
+MAX_OUTPUT_HASH_WORKERS = 8
+
+
+def _substitute_vars(pattern: str, env: dict | None = None) -> str:
+    """Fill ${var} placeholders from env in one pass; unknown variables become '*'."""
+    env = env or {}
+    return var_pattern.sub(
+        lambda match: str(env[match.group(1)]) if match.group(1) in env else "*",
+        pattern,
+    )
+
+
+def _hash_files(file_paths: list[Path]) -> list[str]:
+    """Hash files concurrently, returning digests in the order given."""
+    if len(file_paths) < 2:
+        return [hash_file(file_path) for file_path in file_paths]
+    with ThreadPoolExecutor(max_workers=min(MAX_OUTPUT_HASH_WORKERS, len(file_paths))) as pool:
+        return list(pool.map(hash_file, file_paths))
 
 
 @dataclass(frozen=True)
@@ -49,6 +72,7 @@ class ModuleSummary:
         self.functions: dict[str, ast.AST] = {}
         self.module_aliases: dict[str, str] = {}
         self.symbol_aliases: dict[str, tuple[str, str]] = {}
+        self._source_lines: list[str] | None = None
         self._index()
 
     def _index(self) -> None:
@@ -77,6 +101,27 @@ class ModuleSummary:
     def get_function(self, name: str) -> ast.AST | None:
         return self.functions.get(name)
 
+    def get_source_segment(self, node: ast.AST) -> str | None:
+        """Equivalent to ast.get_source_segment, but splits the source into lines only once."""
+        try:
+            if node.end_lineno is None or node.end_col_offset is None:
+                return None
+            lineno = node.lineno - 1
+            end_lineno = node.end_lineno - 1
+            col_offset = node.col_offset
+            end_col_offset = node.end_col_offset
+        except AttributeError:
+            return None
+        if self._source_lines is None:
+            self._source_lines = source_line_pattern.findall(self.source)
+        lines = self._source_lines
+        # Column offsets are UTF-8 byte offsets
+        if end_lineno == lineno:
+            return lines[lineno].encode()[col_offset:end_col_offset].decode()
+        first = lines[lineno].encode()[col_offset:].decode()
+        last = lines[end_lineno].encode()[:end_col_offset].decode()
+        return "".join([first, *lines[lineno + 1 : end_lineno], last])
+
     def iter_call_targets(self, node: ast.AST) -> Iterable[tuple[str, object]]:
         stack = [node]
         root_ids = {id(node)}
@@ -115,8 +160,17 @@ class PythonFunctionAnalyzer:
         self.root_dirs = [Path(d) for d in (py_dirs or [])]
         self._module_cache: dict[Path, ModuleSummary] = {}
         self._module_cache_by_name: dict[str, ModuleSummary] = {}
+        # Includes misses, e.g. stdlib and third-party modules outside root_dirs
+        self._module_path_cache: dict[str, Path | None] = {}
 
     def build_function_hashes(self, file_path: Path, function_name: str) -> list[dict[str, str]]:
+        digests, _ = self.build_function_hashes_with_files(file_path, function_name)
+        return digests
+
+    def build_function_hashes_with_files(
+        self, file_path: Path, function_name: str
+    ) -> tuple[list[dict[str, str]], set[Path]]:
+        """Hash a function's call closure and return the source files it spans."""
         summary = self._load_module_from_path(file_path)
         if summary is None:
             raise FileNotFoundError(f"Unable to parse module at {file_path}")
@@ -131,7 +185,17 @@ class PythonFunctionAnalyzer:
                 raise ValueError(f"Unable to extract source for {ref.qualname}")
             digest = hashlib.sha1(source.encode()).hexdigest()
             digests.append({"function": ref.qualname, "hash": digest})
-        return digests
+        return digests, {ref.file_path for ref in closure}
+
+    def forget(self, file_paths: Iterable[Path]) -> None:
+        """Drop cached module summaries for files that changed on disk."""
+        stale = {Path(file_path).resolve() for file_path in file_paths}
+        # A changed file may add or move modules, so import lookups are re-probed
+        self._module_path_cache.clear()
+        for file_path in stale:
+            summary = self._module_cache.pop(file_path, None)
+            if summary is not None and summary.module_name:
+                self._module_cache_by_name.pop(summary.module_name, None)
 
     def _collect_closure(self, seed: FunctionRef) -> set[FunctionRef]:
         visited: set[FunctionRef] = set()
@@ -192,7 +256,7 @@ class PythonFunctionAnalyzer:
         node = summary.get_function(ref.name)
         if node is None:
             return None
-        segment = ast.get_source_segment(summary.source, node)
+        segment = summary.get_source_segment(node)
         if segment is not None:
             return segment
         if not hasattr(node, "lineno") or not hasattr(node, "end_lineno"):
@@ -219,6 +283,10 @@ class PythonFunctionAnalyzer:
         return summary
 
     def _load_module_from_path(self, file_path: Path) -> ModuleSummary | None:
+        # FunctionRef paths are already resolved, so try them before paying for realpath
+        cached = self._module_cache.get(file_path)
+        if cached:
+            return cached
         resolved = file_path.resolve()
         cached = self._module_cache.get(resolved)
         if cached:
@@ -256,6 +324,13 @@ class PythonFunctionAnalyzer:
         return None
 
     def _find_module_path(self, module_name: str) -> Path | None:
+        if module_name in self._module_path_cache:
+            return self._module_path_cache[module_name]
+        module_path = self._probe_module_path(module_name)
+        self._module_path_cache[module_name] = module_path
+        return module_path
+
+    def _probe_module_path(self, module_name: str) -> Path | None:
         module_rel = Path(*module_name.split("."))
         for root in self.root_dirs:
             candidate = (root / module_rel).with_suffix(".py")
@@ -283,6 +358,8 @@ class Hasher:
         self.pipeline_config = pipeline_config
         self._duckdb_connection = None
         self._py_function_analyzer: PythonFunctionAnalyzer | None = None
+        # (kind, task, script) -> (file stat signature, code hashes)
+        self._code_hash_memo: dict[tuple[str, ...], tuple[tuple, list[dict[str, str]]]] = {}
         self.task_file_roots: dict[str, Path] = {}
         self.tasks_base_dirs: list[Path] = []
         self.tasks_base_configs: dict[Path, dict[str, Any]] = {}
@@ -466,15 +543,55 @@ class Hasher:
         abs_file_list = get_file_list(full_paths)
         return abs_file_list
 
+    @staticmethod
+    def _file_signature(file_paths: Iterable[str | Path]) -> tuple | None:
+        """Return a sorted (path, mtime_ns, size) tuple, or None if a file is missing."""
+        signature = []
+        for file_path in file_paths:
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                return None
+            signature.append((str(file_path), stat.st_mtime_ns, stat.st_size))
+        return tuple(sorted(signature))
+
+    def _memoized_code_hashes(
+        self,
+        key: tuple[str, ...],
+        compute: Callable[[], tuple[list[dict[str, str]], Iterable[str | Path]]],
+    ) -> list[dict[str, str]]:
+        """Reuse code hashes for a task until one of the files they cover changes."""
+        cached = self._code_hash_memo.get(key)
+        if cached is not None:
+            signature, hashes = cached
+            if self._file_signature(entry[0] for entry in signature) == signature:
+                return hashes
+            if self._py_function_analyzer is not None:
+                self._py_function_analyzer.forget(Path(entry[0]) for entry in signature)
+        hashes, files = compute()
+        signature = self._file_signature(files)
+        if signature is not None:
+            self._code_hash_memo[key] = (signature, hashes)
+        return hashes
+
     def build_r_code_hashes(self, name: str, task: dict = None) -> list[dict[str, str]]:
         """Hash the code of a task to determine if it has changed."""
         if task is None:
             task = self.get_task(name)
         task = self._ensure_task_code_fields(name, task)
         filename = task["r_script"]
-        full_paths, r_tasks_dir = self.get_full_r_script_paths(name, filename)
-        logger.info(f"Building R code hashes for {name}, paths: {full_paths}")
-        return hash_r_files(full_paths, r_tasks_dir)
+
+        def compute() -> tuple[list[dict[str, str]], list[str]]:
+            full_paths, r_tasks_dir = self.get_full_r_script_paths(name, filename)
+            logger.info(f"Building R code hashes for {name}, paths: {full_paths}")
+            abs_file_list = get_file_list(full_paths)
+            return hash_r_file_list(abs_file_list, r_tasks_dir), abs_file_list
+
+        if "$" in filename:
+            # Glob patterns can match new files, which a stat signature cannot see
+            hashes, _ = compute()
+            return hashes
+        return self._memoized_code_hashes(("r", name, filename), compute)
 
     def get_full_py_script_path(self, task_name: str, filename: str) -> Path:
         """Search py_dirs for the Python script."""
@@ -514,17 +631,22 @@ class Hasher:
         task = self._ensure_task_code_fields(name, task)
         # If task["py_script"] is a string, use it as the filename
         filename = task["py_script"] if isinstance(task.get("py_script"), str) else name + ".py"
-        full_path = self.get_full_py_script_path(name, filename)
-        logger.info(f"Building Python code hashes for {name}, path: {full_path}")
-        analyzer = self._get_py_function_analyzer()
         function_name = task.get("py_function") or name
-        try:
-            return analyzer.build_function_hashes(full_path, function_name)
-        except Exception as exc:
-            logger.warning(
-                "Falling back to file hash for %s due to %s", name, exc, exc_info=False
-            )
-            return [{"function": "__file__", "hash": hash_file(full_path)}]
+
+        def compute() -> tuple[list[dict[str, str]], set[Path]]:
+            full_path = self.get_full_py_script_path(name, filename)
+            logger.info(f"Building Python code hashes for {name}, path: {full_path}")
+            analyzer = self._get_py_function_analyzer()
+            try:
+                hashes, files = analyzer.build_function_hashes_with_files(full_path, function_name)
+            except Exception as exc:
+                logger.warning(
+                    "Falling back to file hash for %s due to %s", name, exc, exc_info=False
+                )
+                return [{"function": "__file__", "hash": hash_file(full_path)}], {full_path}
+            return hashes, files | {full_path}
+
+        return self._memoized_code_hashes(("py", name, filename, function_name), compute)
 
     def hash_code_for_task(self, name: str):
         task = self._ensure_task_code_fields(name, self.get_task(name))
@@ -608,8 +730,9 @@ class Hasher:
         alias = "tscache_tbl"
         row_hash_expr = f"md5({alias}::TEXT)"
         aggregate_expr = f"string_agg({row_hash_expr}, '' ORDER BY {row_hash_expr})"
+        # Digest the concatenated row hashes in DuckDB so only 32 hex chars cross over
         query = (
-            f"SELECT {aggregate_expr} AS concatenated_hashes "
+            f"SELECT md5({aggregate_expr}) AS table_hash "
             f"FROM {qualified} AS {alias}"
         )
         try:
@@ -617,14 +740,9 @@ class Hasher:
         except Exception as exc:  # pragma: no cover - depends on duckdb exceptions
             logger.warning("Failed to hash DuckDB output '%s': %s", target, exc)
             return None
-        if not result:
-            return DUCKDB_EMPTY_HASH
-        concatenated_hashes = result[0]
-        if concatenated_hashes is None:
+        if not result or result[0] is None:
             return DUCKDB_EMPTY_HASH
-        if not isinstance(concatenated_hashes, str):
-            concatenated_hashes = str(concatenated_hashes)
-        return hashlib.md5(concatenated_hashes.encode()).hexdigest()
+        return str(result[0])
 
     def _hash_duckdb_outputs(self, targets: list[str]) -> list[dict[str, str]]:
         digests: list[dict[str, str]] = []
@@ -653,11 +771,8 @@ class Hasher:
         file_list: set[Path] = set()
         for output_filepath in file_patterns:
             if "$" in output_filepath:
-                # Check if all variables in the pattern are in the environment
-                # Replace any unknown variables with '*'
-                all_vars = var_pattern.findall(output_filepath)
-                for var in all_vars:
-                    output_filepath = output_filepath.replace(f"${{{var}}}", "*")
+                # Replace the variables with '*' to match any file
+                output_filepath = _substitute_vars(output_filepath)
                 glob_pattern = str(Path(self.output_dir) / output_filepath)
                 matching_files = glob.glob(glob_pattern)
                 if len(matching_files) > 0:
@@ -680,14 +795,14 @@ class Hasher:
         hashed_outputs: list[dict[str, str]] = []
         if len(sorted_file_list) > 0:
             # Hash the contents of the files
-            for file_path in sorted_file_list:
+            for file_path, digest in zip(sorted_file_list, _hash_files(sorted_file_list)):
                 key = str(file_path)
                 if resolved_output_dir:
                     try:
                         key = str(file_path.relative_to(resolved_output_dir))
                     except ValueError:
                         key = str(file_path)
-                hashed_outputs.append({key: hash_file(file_path)})
+                hashed_outputs.append({key: digest})
 
         if duckdb_targets:
             hashed_outputs.extend(self._hash_duckdb_outputs(duckdb_targets))
@@ -709,16 +824,8 @@ class Hasher:
         for pattern in filename_patterns:
             # If the pattern contains a variable, replace it with the value from the environment
             if "$" in pattern:
-                # Check if all variables in the pattern are in the environment
                 # Replace any unknown variables with '*'
-                all_vars = var_pattern.findall(pattern)
-                for var in all_vars:
-                    if var in env:
-                        pattern = pattern.replace(f"${{{var}}}", str(env[var]))
-                    else:
-                        # replace with '*' to match any file
-                        pattern = pattern.replace(f"${{{var}}}", "*")
-                
+                pattern = _substitute_vars(pattern, env)
                 glob_pattern = str(Path(self.output_dir) / pattern)
                 matching_files = glob.glob(glob_pattern)
                 if len(matching_files) == 0:
@@ -731,10 +838,10 @@ class Hasher:
             return
         # Hash the contents of the files
         hashed_output_files: list[dict[str, str]] = []
-        for file_path in sorted_file_list:
+        for file_path, digest in zip(sorted_file_list, _hash_files(sorted_file_list)):
             try:
                 key = str(file_path.relative_to(resolved_output_dir))
             except ValueError:
                 key = str(file_path)
-            hashed_output_files.append({key: hash_file(file_path)})
+            hashed_output_files.append({key: digest})
         return hash_obj(hashed_output_files)
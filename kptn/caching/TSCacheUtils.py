@@ -1,9 +1,36 @@
 import functools
+from typing import Iterable
 
 from kptn.caching.TaskStateCache import TaskStateCache, rscript_task, py_task
 from kptn.util.pipeline_config import PipelineConfig
 from kptn.util.flow_type import is_flow_prefect
-from kptn.util.task_args import build_task_argument_plan, resolve_dependency_key
+from kptn.util.task_args import resolve_dependency_key
+
+
+def summarize_success(flags: Iterable[bool]) -> str:
+    """Return SUCCESS, FAILURE, or INCOMPLETE for all, none, or some truthy flags"""
+    seen_success = seen_failure = False
+    for flag in flags:
+        if flag:
+            seen_success = True
+        else:
+            seen_failure = True
+        if seen_success and seen_failure:
+            return "INCOMPLETE"
+    return "FAILURE" if seen_failure else "SUCCESS"
+
+
+def split_data_args(data_args: dict[str, list], size: int = 10) -> list[dict[str, list]]:
+    """
+    Transform a data_args dictionary into a list of dictionaries with `size` elements
+    e.g. if size = 5
+    {"idx": [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]} -> [{"idx": [1, 2, 3, 4, 5]}, {"idx": [6, 7, 8, 9, 10]}]
+    """
+    keys = list(data_args)
+    starts = range(0, len(data_args["idx"]), size)
+    # Slice each column once, then pivot the per-key chunks into groups
+    columns = [[data_args[key][i:i+size] for i in starts] for key in keys]
+    return [dict(zip(keys, group)) for group in zip(*columns)]
 
 
 def fetch_cached_dep_data(tscache: TaskStateCache, task_name: str):
@@ -13,53 +40,52 @@ def fetch_cached_dep_data(tscache: TaskStateCache, task_name: str):
     value_list: a list of values for the keys of the dependencies; used for mapping tasks
     map_over_count: number of items that will be mapped over (if applicable)
     """
-    deps = tscache.get_dep_list(task_name)
     task = tscache.get_task(task_name)
-    tasks_def = tscache.tasks_config.get("tasks", {})
-    plan = build_task_argument_plan(task_name, task, deps, tasks_def)
-    if plan.errors:
-        for message in plan.errors:
-            tscache.logger.warning(
-                "Task %s configuration issue during argument resolution: %s",
-                task_name,
-                message,
-            )
+    plan = tscache.get_task_argument_plan(task_name)
 
     data_args = {}
     value_list = []
     map_over_count = None
 
-    for dep_name in deps:
-        if tscache.should_cache_result(dep_name):
-            resp = tscache.fetch_state(dep_name)
-            if resp != None and resp.data != "":
-                dep = tscache.get_task(dep_name)
-                key = resolve_dependency_key(task, dep_name, dep, plan.alias_lookup)
-                if not key:
-                    continue
-                if "map_over" in task and "," in key:
-                    keys = key.split(",")
-                    data: list[tuple] = resp.data
-                    # Unpack the tuples into separate lists
-                    # e.g. if key = "a,b" and data = [(1, 2), (3, 4)]
-                    # then data_args["a"] = [1, 3] and data_args["b"] = [2, 4]
-                    for i, key in enumerate(keys):
-                        data_args[key] = [data[j][i] for j in range(len(data))]
-                    # Save the list of values for the keys
-                    # e.g. if data = [(1, 2), (3, 4)]
-                    # then value_list = ["1,2", "3,4"]
-                    value_list = [",".join([str(x) for x in tup]) for tup in data]
+    # Only deps that cache their result carry data, so only their bins are worth reading;
+    # states read while deciding to submit this task are reused
+    cached_deps = [dep for dep in tscache.get_dep_list(task_name) if tscache.should_cache_result(dep)]
+    for dep_name, resp in tscache.get_dep_states(task_name, cached_deps):
+        if resp != None and resp.data != "":
+            dep = tscache.get_task(dep_name)
+            key = resolve_dependency_key(task, dep_name, dep, plan.alias_lookup)
+            if not key:
+                continue
+            if "map_over" in task and "," in key:
+                keys = key.split(",")
+                data: list[tuple] = resp.data
+                # Unpack the tuples into separate lists
+                # e.g. if key = "a,b" and data = [(1, 2), (3, 4)]
+                # then data_args["a"] = [1, 3] and data_args["b"] = [2, 4]
+                # strict=True rejects ragged rows instead of truncating them
+                columns = list(zip(*data, strict=True)) if data else [() for _ in keys]
+                if len(columns) != len(keys):
+                    raise ValueError(
+                        f"Task {task_name}: {dep_name} rows have {len(columns)} fields "
+                        f"but {len(keys)} keys are expected ({key})"
+                    )
+                for key, column in zip(keys, columns):
+                    data_args[key] = list(column)
+                # Save the list of values for the keys
+                # e.g. if data = [(1, 2), (3, 4)]
+                # then value_list = ["1,2", "3,4"]
+                value_list = [",".join(map(str, tup)) for tup in data]
+                map_over_count = len(value_list)
+            else:
+                data_args[key] = resp.data
+                value_list = resp.data
+                if "map_over" in task and isinstance(value_list, list):
                     map_over_count = len(value_list)
-                else:
-                    data_args[key] = resp.data
-                    value_list = resp.data
-                    if "map_over" in task and isinstance(value_list, list):
-                        map_over_count = len(value_list)
     return data_args, value_list, map_over_count
 
 def run_single_task(pipeline_config: PipelineConfig, task_name: str, db_client=None, **kwargs):
     """Execute either an R script or a Python function"""
-    tscache = TaskStateCache(pipeline_config, db_client)
+    tscache = TaskStateCache.get_instance(pipeline_config, db_client)
     data_args, _, _ = fetch_cached_dep_data(tscache, task_name)
 
     if tscache.is_rscript(task_name):
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from contextlib import suppress
 import functools
@@ -6,7 +6,6 @@ import importlib
 import importlib.util
 import logging
 import os
-import json
 import shutil
 import sys
 from typing import Callable, Optional, Union, Mapping, Iterable, Any
@@ -23,16 +22,20 @@ from kptn.caching.Hasher import Hasher
 from kptn.caching.models import TaskState
 from kptn.caching.client.DbClientBase import DbClientBase, init_db_client
 from kptn.codegen.lib.stepfunctions import topological_sort
-from kptn.util.flow_type import is_flow_prefect
+from kptn.util.flow_type import current_flow_run_name, is_flow_prefect
 from kptn.util.logger import get_logger
 from kptn.util.pipeline_config import PipelineConfig, get_storage_key
 from kptn.util.runtime_config import RuntimeConfig
 from kptn.util.rscript import r_script
 from kptn.util.read_tasks_config import read_tasks_config
 from kptn.util.hash import hash_file, hash_obj
-from kptn.util.task_args import plan_python_call
+from kptn.util.task_args import TaskArgumentPlan, build_task_argument_plan, plan_python_call
 from kptn.util.task_dirs import resolve_python_task_dirs
 
+# Deployment flags are fixed for the lifetime of the process (container env)
+_IS_PROD = os.getenv("IS_PROD") == "1"
+_DEPLOY_INLINE = os.getenv("DEPLOY_AS_INLINE_SUBFLOWS") == "1"
+
 
 def _normalize_dependencies(dependencies: Any) -> list[str]:
     """Normalize task dependency declarations into a list of task names."""
@@ -211,6 +214,23 @@ class TaskSubmissionDecision:
     should_run: bool
     reason: str | None = None
 
+@dataclass(frozen=True)
+class _TaskIndex:
+    """Task names grouped by the properties queried on every submission."""
+    source: Mapping[str, Any]
+    names: frozenset[str]
+    resolved: frozenset[str]
+    rscript: frozenset[str]
+    python: frozenset[str]
+    duckdb_sql: frozenset[str]
+    mapped: frozenset[str]
+    returns_list: frozenset[str]
+    cache_result: frozenset[str]
+    main_flow: frozenset[str]
+    map_over_keys: Mapping[str, tuple[str, ...]]
+    # Filled lazily by get_task_argument_plan
+    argument_plans: dict[str, TaskArgumentPlan] = field(default_factory=dict)
+
 class TaskStateCache():
     """
     Given a branch (used in the cache key), a dictionary of task configurations, a directory of R tasks,
@@ -261,6 +281,9 @@ class TaskStateCache():
             self.cache_namespace = cache_namespace
             graphs_block = self.tasks_config.get("graphs") if isinstance(self.tasks_config, Mapping) else None
             self._resolved_graphs = _flatten_graphs(graphs_block or {})
+            self._dep_lists: dict[str, list[str]] = {}
+            self._dep_states_cache: dict[str, list[tuple[str, TaskState]]] = {}
+            self._task_index = self._build_task_index(self.tasks_config.get("tasks") or {})
             self.db_client = db_client or init_db_client(
                 table_name=os.getenv("DYNAMODB_TABLE_NAME", "tasks"),
                 storage_key=storage_key,
@@ -313,9 +336,24 @@ class TaskStateCache():
             )
             self._duckdb_sql_functions: dict[str, Callable[..., object]] = {}
             self._python_module_cache: dict[str, ModuleType] = {}
+            self._python_callables: dict[str, Callable[..., object]] = {}
             self._task_has_prior_runs: dict[str, bool] = {}
         return self
 
+    @classmethod
+    def get_instance(
+        cls,
+        pipeline_config: PipelineConfig,
+        db_client: Optional[DbClientBase] = None,
+        tasks_config = None,
+        tasks_config_paths: list[str] | None = None,
+    ) -> "TaskStateCache":
+        """Return the shared cache, creating it from the given arguments on first use."""
+        instance = cls._instance
+        if instance is not None:
+            return instance
+        return cls(pipeline_config, db_client, tasks_config, tasks_config_paths)
+
     def __str__(self):
         storage_key = get_storage_key(self.pipeline_config)
         return f"TaskStateCache(storage_key={storage_key}, client={self.db_client}, tasks_config={self.tasks_config})"
@@ -393,28 +431,91 @@ class TaskStateCache():
         return topological_sort(task_order, deps_lookup)
 
     def get_dep_list(self, task_name: str) -> list[str]:
-        """Return the names of the dependencies of a task."""
+        """Return the names of the dependencies of a task.
+
+        Dependency lists are normalized once and memoized; the resolved graphs
+        are fixed for the lifetime of the instance.
+        """
+        cached = self._dep_lists.get(task_name)
+        if cached is not None:
+            return cached
         graph_tasks = self._graph_tasks(self.pipeline_name)
         if task_name not in graph_tasks:
-            pipeline_keys_str = json.dumps(list(graph_tasks.keys()))
-            raise KeyError(f"Task ({task_name}) not found in list of tasks; pipeline: {self.pipeline_name}; pipeline_keys: {pipeline_keys_str}")
+            raise KeyError(f"Task ({task_name}) not found in list of tasks; pipeline: {self.pipeline_name}; pipeline_keys: {list(graph_tasks)}")
         entry = graph_tasks[task_name]
         if isinstance(entry, Mapping):
             deps = entry.get("deps")
         else:
             deps = entry
         if isinstance(deps, list):
-            return deps
-        if isinstance(deps, str):
-            return [deps]
-        return []
+            dep_list = deps
+        elif isinstance(deps, str):
+            dep_list = [deps]
+        else:
+            dep_list = []
+        self._dep_lists[task_name] = dep_list
+        return dep_list
     
-    def get_dep_states(self, task_name: str) -> list[tuple[str, TaskState]]:
-        """Return the states of the dependencies of a task."""
-        deps = self.get_dep_list(task_name)
+    def get_dep_states(
+        self, task_name: str, deps: list[str] | None = None
+    ) -> list[tuple[str, TaskState]]:
+        """Return the states of the dependencies of a task (or of the given subset of them).
+
+        While the task is between evaluate_submission and set_final_state, the
+        states read for its evaluation are returned; otherwise they are read fresh.
+        """
+        if deps is None:
+            deps = self.get_dep_list(task_name)
         if not deps:
             return []
-        return [(dep, self.fetch_state(dep)) for dep in deps]
+        cached = self._dep_states_cache.get(task_name)
+        if cached is not None:
+            wanted = set(deps)
+            return [(dep, state) for dep, state in cached if dep in wanted]
+        if not isinstance(self.db_client, DbClientBase):
+            return [(dep, self.fetch_state(dep)) for dep in deps]
+        cached_states = self.db_client.get_tasks_batch(
+            deps, include_data=True, subset_mode=self.pipeline_config.SUBSET_MODE
+        )
+        return [
+            (dep, TaskState.model_validate(cached_states[dep]) if cached_states.get(dep) else None)
+            for dep in deps
+        ]
+
+    def fetch_state_with_dep_states(self, task_name: str) -> Optional[TaskState]:
+        """Fetch a task's state, reading its dependencies' states in the same batch.
+
+        The dependency states are kept for get_dep_states until the task's final
+        state is written (or its evaluation decides to skip it), so evaluating and
+        running a task read its dependencies once.
+        """
+        deps = self.get_dep_list(task_name)
+        if not deps:
+            return self.fetch_state(task_name)
+        self._dep_states_cache.pop(task_name, None)
+        if not isinstance(self.db_client, DbClientBase):
+            state = self.fetch_state(task_name)
+            self._dep_states_cache[task_name] = self.get_dep_states(task_name)
+            return state
+        cached_states = self.db_client.get_tasks_batch(
+            [task_name, *deps], include_data=True, subset_mode=self.pipeline_config.SUBSET_MODE
+        )
+        states = {
+            name: TaskState.model_validate(state) for name, state in cached_states.items() if state
+        }
+        self._dep_states_cache[task_name] = [(dep, states.get(dep)) for dep in deps]
+        return states.get(task_name)
+
+    def release_dep_states(self, task_name: str) -> None:
+        """Drop the dependency states kept for a task's evaluation and run."""
+        self._dep_states_cache.pop(task_name, None)
+
+    def invalidate_dep_states(self, task_name: str) -> None:
+        """Forget cached dependency states that include the state of task_name."""
+        # Other task threads may release entries concurrently, so tolerate missing keys
+        for dependent in list(self._dep_states_cache):
+            if task_name in self.get_dep_list(dependent):
+                self._dep_states_cache.pop(dependent, None)
 
     def get_task(self, name: str):
         """Return the task configuration."""
@@ -425,6 +526,50 @@ class TaskStateCache():
             raise KeyError(f"Task '{name}' not found in list of tasks, {taskname_keys}")
         return task
 
+    def _build_task_index(self, tasks: Mapping[str, Any]) -> _TaskIndex:
+        """Walk the tasks block once and group task names by property."""
+        languages: dict[str, str] = {}
+        for name, task in tasks.items():
+            if not isinstance(task, Mapping):
+                continue
+            # Tasks whose language cannot be resolved are left out so the
+            # predicates fall back to _get_task_language and raise as before.
+            with suppress(KeyError, ValueError, TypeError, AttributeError):
+                languages[name] = self._get_task_language(name, task)
+
+        def names_where(predicate: Callable[[Mapping[str, Any]], bool]) -> frozenset[str]:
+            return frozenset(
+                name for name, task in tasks.items()
+                if isinstance(task, Mapping) and predicate(task)
+            )
+
+        return _TaskIndex(
+            source=tasks,
+            names=frozenset(tasks),
+            resolved=frozenset(languages),
+            rscript=frozenset(name for name, lang in languages.items() if lang == "r"),
+            python=frozenset(name for name, lang in languages.items() if lang == "python"),
+            duckdb_sql=frozenset(name for name, lang in languages.items() if lang == "duckdb_sql"),
+            mapped=names_where(lambda task: "map_over" in task),
+            returns_list=names_where(lambda task: "iterable_item" in task),
+            cache_result=names_where(lambda task: task.get("cache_result") == True),
+            main_flow=names_where(lambda task: task.get("main_flow") == True),
+            map_over_keys={
+                name: tuple(task["map_over"].split(","))
+                for name, task in tasks.items()
+                if isinstance(task, Mapping) and isinstance(task.get("map_over"), str)
+            },
+        )
+
+    def _get_task_index(self) -> _TaskIndex:
+        """Return the task index, rebuilding it if the tasks block was replaced."""
+        tasks = self.tasks_config.get("tasks") or {}
+        index = getattr(self, "_task_index", None)
+        if index is None or index.source is not tasks:
+            index = self._build_task_index(tasks)
+            self._task_index = index
+        return index
+
     def get_task_dask_worker_vars(self, name: str) -> dict:
         """Return task-specific worker_cpu, worker_mem kwargs to the Dask"""
         task = self.get_task(name)
@@ -448,8 +593,10 @@ class TaskStateCache():
 
     def should_cache_result(self, task_name: str) -> bool:
         """Check if the task should cache its results."""
-        task = self.get_task(task_name)
-        return task.get("cache_result") == True
+        index = self._get_task_index()
+        if task_name not in index.names:
+            self.get_task(task_name)
+        return task_name in index.cache_result
 
     def is_wrapper_task(self, task_name: str, task: dict | None = None) -> bool:
         """Check if the task is a wrapper task."""
@@ -562,8 +709,10 @@ class TaskStateCache():
 
     def should_call_on_main_flow(self, task_name: str) -> bool:
         """Check if the task should be called on the main flow."""
-        task = self.get_task(task_name)
-        return task.get("main_flow") == True
+        index = self._get_task_index()
+        if task_name not in index.names:
+            self.get_task(task_name)
+        return task_name in index.main_flow
 
     def get_duckdb_checkpoint(self, task_name: str, task: dict | None = None) -> bool:
         """Return whether DuckDB checkpointing is enabled for a task."""
@@ -785,14 +934,26 @@ class TaskStateCache():
         )
 
     def is_python_task(self, task_name: str, task: dict | None = None) -> bool:
+        if task is None:
+            index = self._get_task_index()
+            if task_name in index.resolved:
+                return task_name in index.python
         return self._get_task_language(task_name, task) == "python"
 
     def is_rscript(self, task_name: str, task: dict | None = None) -> bool:
         """Check if the task is an R script."""
+        if task is None:
+            index = self._get_task_index()
+            if task_name in index.resolved:
+                return task_name in index.rscript
         return self._get_task_language(task_name, task) == "r"
 
     def is_duckdb_sql_task(self, task_name: str, task: dict | None = None) -> bool:
         """Check if the task is backed by a DuckDB SQL script."""
+        if task is None:
+            index = self._get_task_index()
+            if task_name in index.resolved:
+                return task_name in index.duckdb_sql
         try:
             return self._get_task_language(task_name, task) == "duckdb_sql"
         except ValueError:
@@ -1262,10 +1423,15 @@ class TaskStateCache():
             raise AttributeError(
                 f"Task '{task_name}' is not configured as a Python task and cannot be executed as such"
             )
+        cached = self._python_callables.get(task_name)
+        if cached is not None:
+            return cached
         module = self._load_python_module_for_task(task_name, task)
         func_name = self.get_py_func_name(task_name)
         if hasattr(module, func_name):
-            return getattr(module, func_name)
+            task_callable = getattr(module, func_name)
+            self._python_callables[task_name] = task_callable
+            return task_callable
         file_value = self._get_task_file(task_name, task)
         raise AttributeError(
             f"Task '{task_name}' callable '{func_name}' not found in module loaded from '{file_value}'"
@@ -1273,7 +1439,10 @@ class TaskStateCache():
 
     def task_returns_list(self, task_name: str) -> bool:
         """Check if the task is a mapped task."""
-        return "iterable_item" in self.get_task(task_name)
+        index = self._get_task_index()
+        if task_name not in index.names:
+            self.get_task(task_name)
+        return task_name in index.returns_list
 
     def has_mapped_task_deps(self, task_name: str) -> bool:
         """Check if the task has mapped task dependencies."""
@@ -1284,13 +1453,23 @@ class TaskStateCache():
 
     def is_mapped_task(self, task_name: str) -> bool:
         """Check if the task is a mapped task."""
-        return "map_over" in self.get_task(task_name)
+        index = self._get_task_index()
+        if task_name not in index.names:
+            self.get_task(task_name)
+        return task_name in index.mapped
 
     def get_map_over_key(self, task_name: str) -> str|None:
         """Return the key name of a task."""
         task = self.get_task(task_name)
         return task.get("map_over")
 
+    def get_map_over_keys(self, task_name: str) -> tuple[str, ...]:
+        """Return the map_over key names of a task, split on commas."""
+        index = self._get_task_index()
+        if task_name not in index.names:
+            self.get_task(task_name)
+        return index.map_over_keys.get(task_name, ())
+
     def get_map_over_count(self, task_name: str) -> int | None:
         """Return the number of items that a mapped task will iterate over."""
         if not self.is_mapped_task(task_name):
@@ -1300,16 +1479,31 @@ class TaskStateCache():
         _, _, count = fetch_cached_dep_data(self, task_name)
         return count
 
+    def get_task_argument_plan(self, task_name: str) -> TaskArgumentPlan:
+        """Return the (memoized) keyword arguments kptn will supply to a task."""
+        plans = self._get_task_index().argument_plans
+        plan = plans.get(task_name)
+        if plan is None:
+            task = self.get_task(task_name)
+            deps = self.get_dep_list(task_name)
+            tasks_def = self.tasks_config.get("tasks", {})
+            plan = build_task_argument_plan(task_name, task, deps, tasks_def)
+            for message in plan.errors:
+                self.logger.warning(
+                    "Task %s configuration issue during argument resolution: %s",
+                    task_name,
+                    message,
+                )
+            plans[task_name] = plan
+        return plan
+
     def get_key_value(self, task_name: str, kwargs) -> str:
         """Return the key value of a task."""
-        key_name = self.get_map_over_key(task_name)
-        if key_name:
-            if "," in key_name:
-                keys = key_name.split(",")
-                if all(key in kwargs for key in keys):
-                    return ",".join([str(kwargs[key]) for key in keys])
-            elif key_name in kwargs:
-                return kwargs[key_name]
+        keys = self.get_map_over_keys(task_name)
+        if len(keys) == 1:
+            return kwargs.get(keys[0])
+        if keys and all(key in kwargs for key in keys):
+            return ",".join([str(kwargs[key]) for key in keys])
         return None
 
     def get_custom_log_path(self, task_name: str) -> str|None:
@@ -1401,11 +1595,10 @@ class TaskStateCache():
         """Check if the task code has changed."""
         if code_hashes is None:
             return bool(cached_state and cached_state.code_hashes)
-
-        latest_version = hash_obj(code_hashes)
         if not cached_state:
             return True
 
+        latest_version = hash_obj(code_hashes)
         cached_version = cached_state.code_version
         cached_hashes = cached_state.code_hashes
         if latest_version != cached_version:
@@ -1442,28 +1635,25 @@ class TaskStateCache():
 
     def get_input_hashes(self, name: str, dep_states: list[tuple[str, TaskState]]) -> dict[str, str]:
         """Return the output file hashes of the inputs of a task."""
-        inputs_version_tree = {}
-        for dep, dep_state in dep_states:
-            dep_outputs_version = dep_state.outputs_version if dep_state else None
-            if dep_outputs_version:
-                inputs_version_tree[dep] = dep_outputs_version
+        inputs_version_tree = {
+            dep: dep_state.outputs_version
+            for dep, dep_state in dep_states
+            if dep_state and dep_state.outputs_version
+        }
         self.logger.info(f"{name} inputs_version_tree: {inputs_version_tree}")
-        if not inputs_version_tree:
-            return None
-        return inputs_version_tree
+        return inputs_version_tree or None
 
     def get_data_hashes(self, name: str, dep_states: list[tuple[str, TaskState]] = None) -> dict[str, str]:
         """Return the output data hashes of the inputs of a task."""
         if not dep_states:
             dep_states = self.get_dep_states(name)
-        data_version_tree = {}
-        for dep, dep_state in dep_states:
-            if dep_state and dep_state.output_data_version:
-                data_version_tree[dep] = dep_state.output_data_version
+        data_version_tree = {
+            dep: dep_state.output_data_version
+            for dep, dep_state in dep_states
+            if dep_state and dep_state.output_data_version
+        }
         self.logger.info(f"task={name} data_version_tree={data_version_tree}")
-        if not data_version_tree:
-            return None
-        return data_version_tree
+        return data_version_tree or None
 
     def fetch_state(self, task_name) -> Optional[TaskState]:
         """Get cache for a flow or task; return None if not found or outdated."""
@@ -1475,6 +1665,7 @@ class TaskStateCache():
     def delete_state(self, task_name: str):
         """Delete cache for a task"""
         self.db_client.delete_task(task_name)
+        self.invalidate_dep_states(task_name)
 
     def evaluate_submission(
         self,
@@ -1491,7 +1682,7 @@ class TaskStateCache():
         if parameters is None:
             parameters = {}
         task = self.get_task(task_name)
-        cached_state = self.fetch_state(task_name)
+        cached_state = self.fetch_state_with_dep_states(task_name)
         is_r_task = self.is_rscript(task_name, task)
         is_python_task = self.is_python_task(task_name, task)
         is_duckdb_sql_task = self.is_duckdb_sql_task(task_name, task)
@@ -1529,6 +1720,9 @@ class TaskStateCache():
                 reason = "INCOMPLETE"
             elif not cached_state.end_time:
                 reason = "Not finished"
+        if not reason:
+            # The task won't run, so nothing will consume the states read for it
+            self.release_dep_states(task_name)
 
         return TaskSubmissionDecision(
             task_name=task_name,
@@ -1569,15 +1763,16 @@ class TaskStateCache():
         )
         # Run as separate flow container in prod
         if self.is_flow_prefect():
-            if not os.getenv("DEPLOY_AS_INLINE_SUBFLOWS") == "1":
+            if not _DEPLOY_INLINE:
                 from kptn.caching.prefect import run_deployment_task
                 run_deployment_task(deployment_name, task_name, self.pipeline_config, task, reason, self.logger)
+                # The deployment runs (and finalizes) the task in another process
+                self.release_dep_states(task_name)
             else:  # Run as subflow locally
-                import prefect
                 parameters = parameters or {}
                 parameters["task_name"] = task_name
                 parameters["reason"] = reason
-                flow_run_name = f"{task_name}-{prefect.runtime.flow_run.name}-{datetime.now().strftime('%H:%M:%S')}"
+                flow_run_name = f"{task_name}-{current_flow_run_name()}-{datetime.now():%H:%M:%S}"
                 run_task.with_options(flow_run_name=flow_run_name)(
                     self.pipeline_config, **parameters
                 )
@@ -1588,8 +1783,8 @@ class TaskStateCache():
     def log_ecs_task_id(self) -> str:
         """Log the ECS Task ID and memory graph URL"""
         ecs_task_id = fetch_ecs_task_id()
-        metrics_url = build_metrics_url()
-        if os.getenv("IS_PROD") == "1":
+        if _IS_PROD:
+            metrics_url = build_metrics_url()
             self.logger.info(f"Task running as ECS Task {ecs_task_id}; memory graph: {metrics_url}")
         return ecs_task_id
 
@@ -1616,11 +1811,17 @@ class TaskStateCache():
             self.db_client.create_task(task_name, initial_state)
         return initial_state
 
-    def set_final_state(self, task_name: str, status: str = None):
+    def set_final_state(
+        self,
+        task_name: str,
+        status: str = None,
+        dep_states: list[tuple[str, TaskState]] | None = None,
+    ):
         """Set final state for a task"""
         
         task = self.get_task(task_name)
-        dep_states = self.get_dep_states(task_name)
+        if dep_states is None:
+            dep_states = self.get_dep_states(task_name)
         input_file_hashes = self.get_input_hashes(task_name, dep_states)
         input_data_hashes = self.get_data_hashes(task_name, dep_states)
         should_hash_outputs = self._task_has_prior_runs.pop(task_name, False)
@@ -1643,11 +1844,14 @@ class TaskStateCache():
             final_state.status = status
         # FYI output_data_version has already been set in the set_task_ended function
         self.db_client.update_task(task_name, final_state)
+        self.release_dep_states(task_name)
+        self.invalidate_dep_states(task_name)
 
 
+@functools.lru_cache(maxsize=1)
 def fetch_ecs_task_id():
-    """Fetch the ECS Task ID from the ECS metadata endpoint"""
-    if os.getenv("IS_PROD") == "1":
+    """Fetch the ECS Task ID from the ECS metadata endpoint (once per container)"""
+    if _IS_PROD:
         resp = requests.get(f"{os.getenv('ECS_CONTAINER_METADATA_URI_V4')}/task")
         ecs_task_id = resp.json()["TaskARN"].split("/")[-1]
         return ecs_task_id
@@ -1664,7 +1868,7 @@ def build_metrics_url():
 
 def rscript_task(pipeline_config: PipelineConfig, task_name: str, **kwargs):
     """Call a task's R script (this function is called by single and mapped tasks)"""
-    tscache = TaskStateCache(pipeline_config)
+    tscache = TaskStateCache.get_instance(pipeline_config)
     key = tscache.get_key_value(task_name, kwargs)
     idx = kwargs.pop("idx", None)
     if key:
@@ -1685,13 +1889,18 @@ def rscript_task(pipeline_config: PipelineConfig, task_name: str, **kwargs):
     else:
         tscache.db_client.set_task_ended(task_name)
 
+@functools.lru_cache(maxsize=None)
+def _callable_signature(task_callable: Callable) -> inspect.Signature:
+    """Return the (memoized) signature of a task callable."""
+    return inspect.signature(task_callable)
+
 def py_task(pipeline_config: PipelineConfig, task_name: str, **kwargs):
     """Call a Python function (this function is called by single and mapped tasks)"""
     if is_flow_prefect():
         import prefect
         if isinstance(pipeline_config, prefect.unmapped):
             pipeline_config = pipeline_config.value
-    tscache = TaskStateCache(pipeline_config)
+    tscache = TaskStateCache.get_instance(pipeline_config)
     key = tscache.get_key_value(task_name, kwargs)
     idx = kwargs.pop("idx", None)
     if key:
@@ -1714,7 +1923,10 @@ def py_task(pipeline_config: PipelineConfig, task_name: str, **kwargs):
     runtime_config = tscache.build_runtime_config(task_name=task_name)
     tscache._wire_duckdb_client(runtime_config)
     task_callable = tscache.get_python_callable(task_name)
-    signature = inspect.signature(task_callable)
+    try:
+        signature = _callable_signature(task_callable)
+    except TypeError:  # unhashable callable object
+        signature = inspect.signature(task_callable)
     call_args, call_kwargs, missing = plan_python_call(
         signature,
         kwargs,
@@ -46,7 +46,7 @@ def run_batch_array_subtask(
     corresponding element from the map_over input, executes just that subtask,
     and when all subtasks have finished marks the task as SUCCESS.
     """
-    tscache = TaskStateCache(pipeline_config)
+    tscache = TaskStateCache.get_instance(pipeline_config)
     if not tscache.is_mapped_task(task_name):
         raise ValueError(f"Task {task_name} is not a mapped task and cannot be run as a batch array subtask")
 
@@ -12,6 +12,15 @@ class DbClientBase(BaseModel):
     def get_task(self, task_name: str, include_data: bool, subset_mode=False):
         pass
 
+    def get_tasks_batch(self, task_names: list[str], include_data: bool = False, subset_mode=False) -> dict:
+        """Return {task_name: TaskState} for the tasks that exist; backends may override with a bulk read."""
+        tasks = {}
+        for task_name in dict.fromkeys(task_names):
+            task = self.get_task(task_name, include_data=include_data, subset_mode=subset_mode)
+            if task is not None:
+                tasks[task_name] = task
+        return tasks
+
     def get_tasks(self, pipeline: str):
         pass
 
@@ -1,32 +1,116 @@
 
 try:
     import boto3
+    from botocore.config import Config
 except ImportError:
     boto3 = None  # type: ignore[assignment]
+    Config = None  # type: ignore[assignment]
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+try:
+    from amazondax import AmazonDaxClient
+except ImportError:
+    AmazonDaxClient = None  # type: ignore[assignment]
+import itertools
 import os
 import json
 import datetime
+import threading
+import time
 from collections.abc import Sized
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List
+from pydantic import PrivateAttr
 from kptn.caching.client.DbClientBase import DbClientBase
 from kptn.caching.client.dynamodb import (
-    create_subtaskbin,
+    DDB_MAX_BATCH_WRITE_SIZE,
+    batch_put_items,
+    batch_write_requests,
+    build_subtaskbin_item,
+    build_taskdatabin_item,
     create_task,
     create_taskdatabin,
     get_subtaskbins,
     get_single_task,
     get_taskdatabins,
+    get_tasks_batch,
     get_tasks_for_pipeline,
     set_time_in_subitem_in_bin,
     update_task
 )
-from kptn.caching.models import Subtask, TaskState, taskStateAdapter, subtasksAdapter
+from kptn.caching.models import Subtask, TaskState, construct_subtasks, taskStateAdapter
 
 # Subitems are binned to workaround the low batch operation limit (25) of DynamoDB.
 # A bin size of 500 is chosen to keep the app from getting throttled by a rate limit on the number of 
 # updates to a partition per second.
 BIN_SIZE = 500
 
+# Per-task data reads are independent GetItems, so they are overlapped on a shared
+# pool (boto3 clients are thread-safe). Small batches stay serial to skip thread overhead.
+FETCH_POOL_WORKERS = 8
+PARALLEL_FETCH_MIN_TASKS = 3
+_fetch_pool: ThreadPoolExecutor | None = None
+_fetch_pool_lock = threading.Lock()
+
+# Seconds a task's metadata item is served from memory before DynamoDB is re-read.
+# Writes made through this client invalidate it immediately.
+TASK_CACHE_TTL = 5.0
+
+def get_fetch_pool() -> ThreadPoolExecutor:
+    global _fetch_pool
+    if _fetch_pool is None:
+        with _fetch_pool_lock:
+            if _fetch_pool is None:
+                _fetch_pool = ThreadPoolExecutor(max_workers=FETCH_POOL_WORKERS, thread_name_prefix="kptn-ddb")
+    return _fetch_pool
+
+# boto3 clients are shared per region/credentials so their keep-alive connection pool
+# outlives individual DbClientDDB instances; the pool is sized above the fetch pool.
+MAX_POOL_CONNECTIONS = 32
+_clients: Dict[tuple, Any] = {}
+
+def get_dynamodb_client(region=None, aws_auth=None):
+    aws_auth = aws_auth or {}
+    key = (region, tuple(sorted(aws_auth.items())))
+    client = _clients.get(key)
+    if client is None:
+        config = Config(
+            tcp_keepalive=True,
+            max_pool_connections=MAX_POOL_CONNECTIONS,
+            retries={"max_attempts": 10, "mode": "adaptive"},
+        )
+        client = boto3.client("dynamodb", region_name=region, config=config, **aws_auth)
+        _clients[key] = client
+    return client
+
+# Optional DynamoDB Accelerator (DAX) cluster. When set, item reads and writes go through DAX
+# (write-through keeps its item cache coherent); queries and table management stay on DynamoDB,
+# since DAX's query cache is not invalidated by writes. Every writer must use the same cluster.
+DAX_ENDPOINT = os.getenv("KPTN_DAX_ENDPOINT")
+
+def get_dax_client(endpoint, region=None, aws_auth=None):
+    if AmazonDaxClient is None:
+        raise ImportError("KPTN_DAX_ENDPOINT is set but amazon-dax-client is not installed")
+    aws_auth = aws_auth or {}
+    key = ("dax", endpoint, region, tuple(sorted(aws_auth.items())))
+    client = _clients.get(key)
+    if client is None:
+        session = boto3.Session(region_name=region, **aws_auth)
+        client = AmazonDaxClient(session, region_name=region, endpoint_url=endpoint)
+        _clients[key] = client
+    return client
+
+def loads_bin(payload):
+    """Parse a bin's JSON payload, with orjson when available (json still handles NaN/Infinity)."""
+    if orjson is not None:
+        try:
+            return orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(payload)
+
 def calculate_bin_ids(subitem_count: int) -> List[str]:
     if not subitem_count:
         return ["0"]
@@ -48,11 +132,14 @@ def get_count_field(bin_name: str):
 
 class DbClientDDB(DbClientBase):
     client: boto3.client = None
+    item_client: Any = None  # DAX client when KPTN_DAX_ENDPOINT is set, else the DynamoDB client
     table_name: str = os.getenv("DYNAMODB_TABLE_NAME", "tasks")
     storage_key: str
     pipeline: str
     primary_key: str = "PK"
     sort_key: str = "SK"
+    _task_items: Dict[str, tuple] = PrivateAttr(default_factory=dict)
+    _task_items_lock: Any = PrivateAttr(default_factory=threading.Lock)
 
     def __init__(
         self, table_name=None, storage_key=None, pipeline=None, region=None, aws_auth={}
@@ -60,9 +147,9 @@ class DbClientDDB(DbClientBase):
         super().__init__(table_name=table_name, storage_key=storage_key, pipeline=pipeline)
         # aws auth if defined includes aws_access_key_id, aws_secret_access_key, aws_session_token
 
-        self.client = boto3.client(
-            "dynamodb", region_name=os.getenv("AWS_REGION", region), **aws_auth
-        )
+        region = os.getenv("AWS_REGION", region)
+        self.client = get_dynamodb_client(region, aws_auth)
+        self.item_client = get_dax_client(DAX_ENDPOINT, region, aws_auth) if DAX_ENDPOINT else self.client
 
         # ecs_container_metadata_file = os.getenv("ECS_CONTAINER_METADATA_FILE")
         # if ecs_container_metadata_file:
@@ -80,6 +167,25 @@ class DbClientDDB(DbClientBase):
             self.create_table(self.table_name)
         # self.table = self.dynamodb.Table(self.table_name)
 
+    def _get_task_item(self, task_name):
+        """Return a copy of the raw task item, re-reading DynamoDB once TASK_CACHE_TTL has passed."""
+        now = time.monotonic()
+        cached = self._task_items.get(task_name)
+        if cached is not None and now - cached[0] < TASK_CACHE_TTL:
+            item = cached[1]
+        else:
+            item = get_single_task(
+                self.item_client, self.table_name, self.storage_key, self.pipeline, task_name
+            )
+            with self._task_items_lock:
+                self._task_items[task_name] = (now, item)
+        return dict(item) if item is not None else None
+
+    def invalidate(self, task_name):
+        """Drop the cached metadata item for a task."""
+        with self._task_items_lock:
+            self._task_items.pop(task_name, None)
+
     def create_table(self, table_name):
         # Pass if the table already exists
         try:
@@ -114,36 +220,36 @@ class DbClientDDB(DbClientBase):
             raw_task['taskdata_count'] = len(data)
 
         create_task(
-            self.client,
+            self.item_client,
             self.table_name,
             self.storage_key,
             self.pipeline,
             task_name,
             raw_task,
         )
+        self.invalidate(task_name)
         if data:
             self.create_taskdata(task_name, data, "TASKDATABIN")
 
     def create_taskdata(self, task_name, data, bin_name="TASKDATABIN"):
         if isinstance(data, list):
-            # Break up the data into bins
-            for i in range(0, len(data), BIN_SIZE):
-                bin_id = f"{i // BIN_SIZE}"
-                binned_items = data[i : i + BIN_SIZE]
-                create_taskdatabin(
-                    self.client,
-                    self.table_name,
+            # Break up the data into bins, written up to 25 per BatchWriteItem call
+            items = [
+                build_taskdatabin_item(
                     self.storage_key,
                     self.pipeline,
                     task_name,
                     bin_name,
-                    bin_id,
-                    binned_items,
+                    f"{i // BIN_SIZE}",
+                    data[i : i + BIN_SIZE],
                 )
+                for i in range(0, len(data), BIN_SIZE)
+            ]
+            batch_put_items(self.item_client, self.table_name, items)
         else:
             bin_id = "0"
             create_taskdatabin(
-                self.client,
+                self.item_client,
                 self.table_name,
                 self.storage_key,
                 self.pipeline,
@@ -158,34 +264,39 @@ class DbClientDDB(DbClientBase):
         if update_count:
             update = {"subtask_count": len(data)}
             update_task(
-                self.client,
+                self.item_client,
                 self.table_name,
                 self.storage_key,
                 self.pipeline,
                 task_name,
                 update,
             )
+            self.invalidate(task_name)
         assert isinstance(data, list)
-        # Break up the data into bins
-        for j in range(0, len(data), BIN_SIZE):
-            bin_id = f"{j // BIN_SIZE}"
-            binned_items = [{"i": i, "key": data[i]} for i in range(j, min(j + BIN_SIZE, len(data)))]
-            create_subtaskbin(
-                self.client,
-                self.table_name,
-                self.storage_key,
-                self.pipeline,
-                task_name,
-                bin_id,
-                binned_items,
+        # Break up the data into bins, written up to 25 per BatchWriteItem call
+        items = []
+        for start in range(0, len(data), BIN_SIZE):
+            binned_items = [
+                {"i": i, "key": key}
+                for i, key in enumerate(data[start : start + BIN_SIZE], start)
+            ]
+            items.append(
+                build_subtaskbin_item(
+                    self.storage_key,
+                    self.pipeline,
+                    task_name,
+                    f"{start // BIN_SIZE}",
+                    binned_items,
+                )
             )
+        batch_put_items(self.item_client, self.table_name, items)
 
     def set_subtask_started(self, task_name: str, index: str):
         bin_id = f"{index // BIN_SIZE}"
         adjusted_index = index % BIN_SIZE
         time_value = datetime.datetime.now().isoformat()
         set_time_in_subitem_in_bin(
-            self.client,
+            self.item_client,
             self.table_name,
             self.storage_key,
             self.pipeline,
@@ -201,7 +312,7 @@ class DbClientDDB(DbClientBase):
         adjusted_index = index % BIN_SIZE
         end_time = datetime.datetime.now().isoformat()
         set_time_in_subitem_in_bin(
-            self.client,
+            self.item_client,
             self.table_name,
             self.storage_key,
             self.pipeline,
@@ -220,13 +331,14 @@ class DbClientDDB(DbClientBase):
             if isinstance(result, Sized):
                 update["subset_count"] = len(result)
             update_task(
-                self.client,
+                self.item_client,
                 self.table_name,
                 self.storage_key,
                 self.pipeline,
                 task_name,
                 update,
             )
+            self.invalidate(task_name)
             # print("set_task_ended: Creating subset data", result)
             self.create_taskdata(task_name, result, "SUBSETBIN")
             return
@@ -243,30 +355,55 @@ class DbClientDDB(DbClientBase):
         if status:
             update["status"] = status
         update_task(
-            self.client,
+            self.item_client,
             self.table_name,
             self.storage_key,
             self.pipeline,
             task_name,
             update,
         )
+        self.invalidate(task_name)
         if result:
             self.create_taskdata(task_name, result, "TASKDATABIN")
 
     def update_task(self, task_name, task: TaskState):
         update_task(
-            self.client,
+            self.item_client,
             self.table_name,
             self.storage_key,
             self.pipeline,
             task_name,
             task.model_dump(exclude_none=True),
         )
+        self.invalidate(task_name)
 
     def get_task(self, task_name, include_data=False, subset_mode=False) -> TaskState:
-        single_task = get_single_task(
-            self.client, self.table_name, self.storage_key, self.pipeline, task_name
+        single_task = self._get_task_item(task_name)
+        return self._to_task_state(task_name, single_task, include_data, subset_mode)
+
+    def get_tasks_batch(self, task_names, include_data=False, subset_mode=False) -> dict[str, TaskState]:
+        """Fetch several tasks with one BatchGetItem round trip instead of one GetItem each."""
+        raw_tasks = get_tasks_batch(
+            self.item_client, self.table_name, self.storage_key, self.pipeline, list(task_names)
         )
+        now = time.monotonic()
+        with self._task_items_lock:
+            for task_name, raw_task in raw_tasks.items():
+                self._task_items[task_name] = (now, dict(raw_task))
+        if not include_data or len(raw_tasks) < PARALLEL_FETCH_MIN_TASKS:
+            return {
+                task_name: self._to_task_state(task_name, raw_task, include_data, subset_mode)
+                for task_name, raw_task in raw_tasks.items()
+            }
+        # Loading task data costs one GetItem per bin per task; overlap those round trips
+        task_names = list(raw_tasks)
+        states = get_fetch_pool().map(
+            lambda task_name: self._to_task_state(task_name, raw_tasks[task_name], include_data, subset_mode),
+            task_names,
+        )
+        return dict(zip(task_names, states))
+
+    def _to_task_state(self, task_name, single_task, include_data=False, subset_mode=False) -> TaskState:
         if single_task and include_data and "taskdata_count" in single_task:
             bin_ids = calculate_bin_ids(single_task["taskdata_count"])
             # if subset mode, try to get subset data; if it doesn't exist, get task data
@@ -301,20 +438,17 @@ class DbClientDDB(DbClientBase):
 
         bin_name = "SUBSETBIN" if subset_mode else "TASKDATABIN"
         databins = get_taskdatabins(
-            self.client, self.table_name, self.storage_key, self.pipeline, task_name, bin_ids, bin_name
+            self.item_client, self.table_name, self.storage_key, self.pipeline, task_name, bin_ids, bin_name
         )
         # If data isn't broken up into bins, return it as is
         if len(databins) == 1:
             # Try to parse the data as JSON
             try:
-                return json.loads(databins[0]["data"])
+                return loads_bin(databins[0]["data"])
             except json.JSONDecodeError:
                 return databins[0]["data"]
         # Else concatenate the data from all bins
-        data = []
-        for bin in databins:
-            data.extend(json.loads(bin["data"]))
-        return data
+        return list(itertools.chain.from_iterable(loads_bin(bin["data"]) for bin in databins))
 
     def get_subtasks(self, task_name, bin_ids=None) -> list[Subtask]:
         if bin_ids is None:
@@ -324,12 +458,11 @@ class DbClientDDB(DbClientBase):
             bin_ids = calculate_bin_ids(t.subtask_count)
 
         databins = get_taskdatabins(
-            self.client, self.table_name, self.storage_key, self.pipeline, task_name, bin_ids, "SUBTASKBIN"
+            self.item_client, self.table_name, self.storage_key, self.pipeline, task_name, bin_ids, "SUBTASKBIN"
         )
-        data = []
-        for databin in databins:
-            data.extend(databin["items"])
-        return subtasksAdapter.validate_python(data)
+        data = list(itertools.chain.from_iterable(databin["items"] for databin in databins))
+        # Bins are only written by create_subtasks, so their shape is trusted
+        return construct_subtasks(data)
 
     def reset_subset_of_subtasks(self, task_name: str, subset: List[str]):
         """
@@ -345,48 +478,47 @@ class DbClientDDB(DbClientBase):
         """
         pass
 
-    def _batch_delete_bins(
-        self, storage_key: str, pipeline_id: str, task_id: str, bin_type: str, bin_ids: List[str]
-    ):
-        """Utility function to delete multiple subtask bins in a single batch."""
-        request_items = {
-            self.table_name: [
-                {
-                    "DeleteRequest": {
-                        "Key": {
-                            self.primary_key: {"S": f"BRANCH#{storage_key}#PIPELINE#{pipeline_id}#TASK#{task_id}#{bin_type}#{bin_id}"},
-                            self.sort_key: { "S": f"BIN#{bin_id}" }
-                        }
+    def _bin_delete_requests(self, task_id: str, bin_type: str, task: TaskState) -> List[Dict[str, Any]]:
+        """Build the BatchWriteItem DeleteRequests for a task's bins of one type."""
+        count_field = get_count_field(bin_type)
+        bin_ids = calculate_bin_ids(getattr(task, count_field))
+        print("Deleting bins", bin_ids)
+        pk_prefix = f"BRANCH#{self.storage_key}#PIPELINE#{self.pipeline}#TASK#{task_id}#{bin_type}#"
+        return [
+            {
+                "DeleteRequest": {
+                    "Key": {
+                        self.primary_key: {"S": f"{pk_prefix}{bin_id}"},
+                        self.sort_key: {"S": f"BIN#{bin_id}"},
                     }
                 }
-                for bin_id in bin_ids
-            ]
-        }
-        self.client.batch_write_item(RequestItems=request_items)
+            }
+            for bin_id in bin_ids
+        ]
+
+    def _send_delete_requests(self, requests: List[Dict[str, Any]]):
+        """Send delete requests in BatchWriteItem chunks, overlapping the chunks on the fetch pool."""
+        chunks = [
+            requests[i : i + DDB_MAX_BATCH_WRITE_SIZE]
+            for i in range(0, len(requests), DDB_MAX_BATCH_WRITE_SIZE)
+        ]
+        if len(chunks) < 2:
+            for chunk in chunks:
+                batch_write_requests(self.item_client, self.table_name, chunk)
+            return
+        # list() drains the iterator so any ClientError is raised here
+        list(get_fetch_pool().map(
+            lambda chunk: batch_write_requests(self.item_client, self.table_name, chunk),
+            chunks,
+        ))
 
     def delete_bins(self, task_id: str, bin_type: str, task: TaskState = None):
         if task is None:
             task = self.get_task(task_id)
             if task is None:
                 return
-        count_field = get_count_field(bin_type)
-        bin_ids = calculate_bin_ids(getattr(task, count_field))
-        DDB_MAX_BATCH_SIZE = (
-            25  # Max number of items that can be deleted in a single batch
-        )
+        self._send_delete_requests(self._bin_delete_requests(task_id, bin_type, task))
 
-        # bins = get_taskdatabins(
-        #     self.client, self.table_name, self.storage_key, self.pipeline, task_id, bin_ids, bin_type
-        # )
-        print("Deleting bins", bin_ids)
-        for i in range(0, len(bin_ids), DDB_MAX_BATCH_SIZE):
-            self._batch_delete_bins(
-                self.storage_key,
-                self.pipeline,
-                task_id,
-                bin_type,
-                bin_ids[i : i + DDB_MAX_BATCH_SIZE],
-            )
     def delete_subsetdata(self, task_id: str):
         self.delete_bins(task_id, "SUBSETBIN")
 
@@ -395,15 +527,18 @@ class DbClientDDB(DbClientBase):
         task = self.get_task(task_id)
         if task is None:
             return
-        self.delete_bins(task_id, "SUBTASKBIN", task)
-        self.delete_bins(task_id, "TASKDATABIN", task)
-        self.delete_bins(task_id, "SUBSETBIN", task)
+        # Delete all three bin types in one fan-out rather than bin type by bin type
+        requests = []
+        for bin_type in ("SUBTASKBIN", "TASKDATABIN", "SUBSETBIN"):
+            requests.extend(self._bin_delete_requests(task_id, bin_type, task))
+        self._send_delete_requests(requests)
 
         # Delete the task itself
-        self.client.delete_item(
+        self.item_client.delete_item(
             TableName=self.table_name,
             Key={
                 self.primary_key: {"S": f"BRANCH#{self.storage_key}"},
                 self.sort_key: {"S": f"PIPELINE#{self.pipeline}#TASK#{task_id}"},
             },
         )
+        self.invalidate(task_id)
@@ -4,17 +4,24 @@ Operations module for DynamoDB client functions.
 This module exposes all the individual operation functions used by the DynamoDB client.
 """
 
-from .create_subtaskbin import create_subtaskbin
+from .batch_put_items import DDB_MAX_BATCH_WRITE_SIZE, batch_put_items, batch_write_requests
+from .create_subtaskbin import build_subtaskbin_item, create_subtaskbin
 from .create_task import create_task
-from .create_taskdatabin import create_taskdatabin
+from .create_taskdatabin import build_taskdatabin_item, create_taskdatabin
 from .get_subtaskbins import get_subtaskbins
 from .get_task import get_single_task
 from .get_taskdata import get_taskdatabins
 from .get_tasks import get_tasks_for_pipeline
+from .get_tasks_batch import get_tasks_batch
 from .set_subtask_time import set_time_in_subitem_in_bin
 from .update_task import update_task
 
 __all__ = [
+    "DDB_MAX_BATCH_WRITE_SIZE",
+    "batch_put_items",
+    "batch_write_requests",
+    "build_subtaskbin_item",
+    "build_taskdatabin_item",
     "create_subtaskbin",
     "create_task", 
     "create_taskdatabin",
@@ -22,6 +29,7 @@ __all__ = [
     "get_single_task",
     "get_taskdatabins", 
     "get_tasks_for_pipeline",
+    "get_tasks_batch",
     "set_time_in_subitem_in_bin",
     "update_task"
 ]
\ No newline at end of file
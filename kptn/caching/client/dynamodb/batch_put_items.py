@@ -0,0 +1,39 @@
+import boto3
+from botocore.exceptions import ClientError
+from typing import Dict, Any, List
+from kptn.util.logger import get_logger
+from .retry_unprocessed import retry_unprocessed
+
+# BatchWriteItem accepts at most 25 put/delete requests per call
+DDB_MAX_BATCH_WRITE_SIZE = 25
+
+
+def batch_write_requests(dynamodb: boto3.client, table_name: str, requests: List[Dict[str, Any]]) -> None:
+    """
+    Send PutRequest/DeleteRequest entries to the DynamoDB table with BatchWriteItem.
+
+    :param table_name: The name of the DynamoDB table
+    :param requests: BatchWriteItem request entries (e.g. {'DeleteRequest': {'Key': ...}})
+    """
+    logger = get_logger()
+    for start in range(0, len(requests), DDB_MAX_BATCH_WRITE_SIZE):
+        request_items = {table_name: requests[start : start + DDB_MAX_BATCH_WRITE_SIZE]}
+        try:
+            # Throttled writes come back as UnprocessedItems and must be retried with backoff
+            for _ in retry_unprocessed(
+                lambda items: dynamodb.batch_write_item(RequestItems=items), request_items, 'UnprocessedItems'
+            ):
+                pass
+        except ClientError as e:
+            logger.error(f"Error writing items: {e.response['Error']['Message']}")
+            raise
+
+
+def batch_put_items(dynamodb: boto3.client, table_name: str, items: List[Dict[str, Any]]) -> None:
+    """
+    Put several items into the DynamoDB table with BatchWriteItem.
+
+    :param table_name: The name of the DynamoDB table
+    :param items: Items in DynamoDB attribute-value form
+    """
+    batch_write_requests(dynamodb, table_name, [{'PutRequest': {'Item': item}} for item in items])
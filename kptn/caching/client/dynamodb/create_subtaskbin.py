@@ -4,20 +4,18 @@ from typing import Dict, Any, List
 import datetime
 
 
-def create_subtaskbin(dynamodb: boto3.client, table_name: str, storage_key: str, pipeline_id: str, task_id: str, bin_id: str, binned_items: List[Dict[str, Any]]) -> Dict[str, Any]:
+def build_subtaskbin_item(storage_key: str, pipeline_id: str, task_id: str, bin_id: str, binned_items: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
-    Create a new subtask bin in the DynamoDB table using boto3.client.
+    Build the DynamoDB item for a subtask bin.
 
-    :param table_name: The name of the DynamoDB table
     :param storage_key: The branch or desired key name to group task state by
     :param pipeline_id: The pipeline ID
     :param task_id: The task ID
     :param bin_id: The subtask bin ID
-    :param data: A dictionary of subtask bin attributes
-    :return: The created subtask bin
+    :param binned_items: The subtask entries stored in the bin
+    :return: The item in DynamoDB attribute-value form
     """
 
-    # Construct the item to be inserted
     timestamp = datetime.datetime.now().isoformat()
     item = {
         'PK': {'S': f'BRANCH#{storage_key}#PIPELINE#{pipeline_id}#TASK#{task_id}#SUBTASKBIN#{bin_id}'},
@@ -29,7 +27,23 @@ def create_subtaskbin(dynamodb: boto3.client, table_name: str, storage_key: str,
 
     # Add task data to the item
     item['items'] = {'L': [{'M': {k: {'S': str(v)} for k, v in obj.items()}} for obj in binned_items]}
+    return item
+
+
+def create_subtaskbin(dynamodb: boto3.client, table_name: str, storage_key: str, pipeline_id: str, task_id: str, bin_id: str, binned_items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Create a new subtask bin in the DynamoDB table using boto3.client.
+
+    :param table_name: The name of the DynamoDB table
+    :param storage_key: The branch or desired key name to group task state by
+    :param pipeline_id: The pipeline ID
+    :param task_id: The task ID
+    :param bin_id: The subtask bin ID
+    :param data: A dictionary of subtask bin attributes
+    :return: The created subtask bin
+    """
 
+    item = build_subtaskbin_item(storage_key, pipeline_id, task_id, bin_id, binned_items)
     try:
         response = dynamodb.put_item(
             TableName=table_name,
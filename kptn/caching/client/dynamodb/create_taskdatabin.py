@@ -1,25 +1,36 @@
 import boto3
 from botocore.exceptions import ClientError
 import json
+import zlib
 from typing import Dict, Any, List
 import datetime
 
+# JSON payloads at least this large are stored zlib-compressed as binary, tagged with `codec`;
+# structured bin data typically shrinks several-fold, cutting the read/write units per bin
+COMPRESSED_BIN_CODEC = "zlib"
+COMPRESS_MIN_BYTES = 1024
 
-def create_taskdatabin(dynamodb: boto3.client, table_name: str, storage_key: str, pipeline_id: str, task_id: str, bin_name:str, bin_id: str, data: Any) -> Dict[str, Any]:
+def _json_attribute(data: Any) -> tuple[Dict[str, Any], str | None]:
+    """Return the attribute value for a JSON-serializable payload and the codec it was stored with."""
+    payload = json.dumps(data)
+    if len(payload) < COMPRESS_MIN_BYTES:
+        return {'S': payload}, None
+    return {'B': zlib.compress(payload.encode(), 3)}, COMPRESSED_BIN_CODEC
+
+
+def build_taskdatabin_item(storage_key: str, pipeline_id: str, task_id: str, bin_name: str, bin_id: str, data: Any) -> Dict[str, Any]:
     """
-    Create a new taskdata bin in the DynamoDB table using boto3.client.
+    Build the DynamoDB item for a taskdata bin.
 
-    :param table_name: The name of the DynamoDB table
     :param storage_key: The branch or desired key name to group task state by
     :param pipeline_id: The pipeline ID
     :param task_id: The task ID
     :param bin_name: Either 'TASKDATABIN' or 'SUBSETBIN'
     :param bin_id: The taskdata bin ID
     :param data: A dictionary of taskdata bin attributes
-    :return: The created taskdata bin
+    :return: The item in DynamoDB attribute-value form
     """
 
-    # Construct the item to be inserted
     timestamp = datetime.datetime.now().isoformat()
     item = {
         'PK': {'S': f'BRANCH#{storage_key}#PIPELINE#{pipeline_id}#TASK#{task_id}#{bin_name}#{bin_id}'},
@@ -30,15 +41,31 @@ def create_taskdatabin(dynamodb: boto3.client, table_name: str, storage_key: str
     }
 
     # Add task data to the item
-    if isinstance(data, list):
-        # Store list values as strings
-        item['data'] = {'S': json.dumps(data)}
-    elif isinstance(data, dict):
-        # Store dictionary value as string
-        item['data'] = {'S': json.dumps(data)}
+    if isinstance(data, (list, dict)):
+        # Store list and dictionary values as JSON
+        item['data'], codec = _json_attribute(data)
+        if codec:
+            item['codec'] = {'S': codec}
     else:
         item['data'] = {'S': str(data)}
+    return item
+
+
+def create_taskdatabin(dynamodb: boto3.client, table_name: str, storage_key: str, pipeline_id: str, task_id: str, bin_name:str, bin_id: str, data: Any) -> Dict[str, Any]:
+    """
+    Create a new taskdata bin in the DynamoDB table using boto3.client.
+
+    :param table_name: The name of the DynamoDB table
+    :param storage_key: The branch or desired key name to group task state by
+    :param pipeline_id: The pipeline ID
+    :param task_id: The task ID
+    :param bin_name: Either 'TASKDATABIN' or 'SUBSETBIN'
+    :param bin_id: The taskdata bin ID
+    :param data: A dictionary of taskdata bin attributes
+    :return: The created taskdata bin
+    """
 
+    item = build_taskdatabin_item(storage_key, pipeline_id, task_id, bin_name, bin_id, data)
     try:
         response = dynamodb.put_item(
             TableName=table_name,
@@ -1,9 +1,7 @@
 import boto3
-from boto3.dynamodb.types import TypeDeserializer
 from botocore.exceptions import ClientError
 from typing import List, Dict, Any
-
-deserializer = TypeDeserializer()
+from .get_taskdata import decode_attribute
 
 def get_subtaskbins(dynamodb: boto3.client, table_name: str, storage_key: str, pipeline_id: str, task_id: str) -> List[Dict[str, Any]]:
     """
@@ -24,32 +22,17 @@ def get_subtaskbins(dynamodb: boto3.client, table_name: str, storage_key: str, p
     }
 
     tasks = []
-    last_evaluated_key = None
+    # The paginator follows LastEvaluatedKey for us
+    paginator = dynamodb.get_paginator('query')
 
     try:
-        while True:
-            if last_evaluated_key:
-                response = dynamodb.query(
-                    TableName=table_name,
-                    KeyConditionExpression=key_condition_expression,
-                    ExpressionAttributeValues=expression_attribute_values,
-                    ExclusiveStartKey=last_evaluated_key
-                )
-            else:
-                response = dynamodb.query(
-                    TableName=table_name,
-                    KeyConditionExpression=key_condition_expression,
-                    ExpressionAttributeValues=expression_attribute_values
-                )
-
-            # Process the items
-            for item in response.get('Items', []):
-                tasks.append({k: deserializer.deserialize(v) for k, v in item.items()})
-
-            # Check if there are more items to fetch
-            last_evaluated_key = response.get('LastEvaluatedKey')
-            if not last_evaluated_key:
-                break
+        for page in paginator.paginate(
+            TableName=table_name,
+            KeyConditionExpression=key_condition_expression,
+            ExpressionAttributeValues=expression_attribute_values,
+        ):
+            for item in page.get('Items', []):
+                tasks.append({k: decode_attribute(v) for k, v in item.items()})
 
         return tasks
 
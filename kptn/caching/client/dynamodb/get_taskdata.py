@@ -1,16 +1,45 @@
 import boto3
+import zlib
 from boto3.dynamodb.types import TypeDeserializer
 from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any
 from kptn.util.logger import get_logger
+from .create_taskdatabin import COMPRESSED_BIN_CODEC
+from .get_tasks_batch import DDB_MAX_BATCH_GET_SIZE
+from .retry_unprocessed import retry_unprocessed
 
 deserializer = TypeDeserializer()
 
+# Tasks with more than one BatchGetItem's worth of bins fetch the chunks concurrently
+MAX_CONCURRENT_BATCH_GETS = 8
+
+def decode_attribute(value: Dict[str, Any]) -> Any:
+    """
+    Decode a DynamoDB attribute value. Bins only hold strings, lists of maps, and maps of strings,
+    so those are unpacked inline; anything else goes through the generic TypeDeserializer.
+    """
+    if 'S' in value:
+        return value['S']
+    if 'L' in value:
+        return [decode_attribute(v) for v in value['L']]
+    if 'M' in value:
+        return {k: decode_attribute(v) for k, v in value['M'].items()}
+    return deserializer.deserialize(value)
+
+def _deserialize_bin(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Unpack a bin item without the generic deserializer, inflating compressed data back to JSON text."""
+    if item.get('codec', {}).get('S') == COMPRESSED_BIN_CODEC:
+        item = {**item, 'data': {'S': zlib.decompress(item['data']['B']).decode()}}
+    return {k: decode_attribute(v) for k, v in item.items()}
+
 # ':pk': {'S': f'BRANCH#{storage_key}#PIPELINE#{pipeline_id}#TASK#{task_id}#{bin_name}#'},
 
 def get_taskdatabins(dynamodb: boto3.client, table_name: str, storage_key: str, pipeline_id: str, task_id: str, bin_ids: List[str], bin_name="TASKDATABIN") -> List[Dict[str, Any]]:
     """
     Retrieve all taskdata bins for a specific task in a pipeline from the DynamoDB table.
+    Bins are fetched with BatchGetItem (up to 100 per round trip) and returned in `bin_ids` order;
+    only the BinId, data, items, and codec attributes are read.
 
     :param table_name: The name of the DynamoDB table
     :param storage_key: The branch or desired key name to group task state by
@@ -22,27 +51,58 @@ def get_taskdatabins(dynamodb: boto3.client, table_name: str, storage_key: str,
     """
 
     logger = get_logger()
+    pk_prefix = f'BRANCH#{storage_key}#PIPELINE#{pipeline_id}#TASK#{task_id}#{bin_name}#'
+    unique_ids = list(dict.fromkeys(bin_ids))
+    chunks = [
+        unique_ids[start : start + DDB_MAX_BATCH_GET_SIZE]
+        for start in range(0, len(unique_ids), DDB_MAX_BATCH_GET_SIZE)
+    ]
+
+    def fetch_chunk(chunk: List[str]) -> List[Dict[str, Any]]:
+        keys = [
+            {
+                'PK': {'S': f'{pk_prefix}{bin_id}'},
+                'SK': {'S': f'BIN#{bin_id}'},
+            }
+            for bin_id in chunk
+        ]
+        # Only read what callers use; "data" and "items" are DynamoDB reserved words
+        request_items = {
+            table_name: {
+                'Keys': keys,
+                'ProjectionExpression': '#b, #d, #i, #c',
+                'ExpressionAttributeNames': {'#b': 'BinId', '#d': 'data', '#i': 'items', '#c': 'codec'},
+            }
+        }
+        items = []
+        # Throttled or oversized (16MB) responses return the rest as UnprocessedKeys
+        for response in retry_unprocessed(
+            lambda keys: dynamodb.batch_get_item(RequestItems=keys), request_items, 'UnprocessedKeys'
+        ):
+            items.extend(response.get('Responses', {}).get(table_name, []))
+        return items
+
+    found: Dict[str, Dict[str, Any]] = {}
+    try:
+        if len(chunks) > 1:
+            # A private pool, since callers may already be running on DbClientDDB's fetch pool
+            with ThreadPoolExecutor(max_workers=min(len(chunks), MAX_CONCURRENT_BATCH_GETS)) as executor:
+                chunk_items = list(executor.map(fetch_chunk, chunks))
+        else:
+            chunk_items = [fetch_chunk(chunk) for chunk in chunks]
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ResourceNotFoundException':
+            print(f'Items {bin_ids} not found in PK: {pk_prefix}')
+            return []
+        raise e
+    for items in chunk_items:
+        for item in items:
+            found[item['BinId']['S']] = _deserialize_bin(item)
+
     taskdatabins = []
-    for bin_id in bin_ids:
-        try:
-            response = dynamodb.get_item(
-                TableName=table_name,
-                Key={
-                    'PK': {'S': f'BRANCH#{storage_key}#PIPELINE#{pipeline_id}#TASK#{task_id}#{bin_name}#{bin_id}'},
-                    'SK': {'S': f'BIN#{bin_id}'},
-                }
-            )
-
-
-            # Check if the item was found
-            if 'Item' in response:
-                taskdatabin = {k: deserializer.deserialize(v) for k, v in response['Item'].items()}
-                taskdatabins.append(taskdatabin)
-            else:
-                logger.info(f"Item {bin_id} not found in PK: BRANCH#{storage_key}#PIPELINE#{pipeline_id}#TASK#{task_id}#{bin_name}#")
-        except ClientError as e:
-            if e.response['Error']['Code'] == 'ResourceNotFoundException':
-                print(f'Item {bin_id} not found in PK: BRANCH#{storage_key}#PIPELINE#{pipeline_id}#TASK#{task_id}#{bin_name}#')
-            else:
-                raise e
-    return taskdatabins
\ No newline at end of file
+    for bin_id in unique_ids:
+        if bin_id in found:
+            taskdatabins.append(found[bin_id])
+        else:
+            logger.info(f"Item {bin_id} not found in PK: {pk_prefix}")
+    return taskdatabins
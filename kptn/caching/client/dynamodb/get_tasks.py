@@ -21,33 +21,18 @@ def get_tasks_for_pipeline(dynamodb: boto3.client, table_name: str, storage_key:
     }
 
     tasks = []
-    last_evaluated_key = None
+    # The paginator follows LastEvaluatedKey for us
+    paginator = dynamodb.get_paginator('query')
 
     try:
-        while True:
-            if last_evaluated_key:
-                response = dynamodb.query(
-                    TableName=table_name,
-                    KeyConditionExpression=key_condition_expression,
-                    ExpressionAttributeValues=expression_attribute_values,
-                    ExclusiveStartKey=last_evaluated_key
-                )
-            else:
-                response = dynamodb.query(
-                    TableName=table_name,
-                    KeyConditionExpression=key_condition_expression,
-                    ExpressionAttributeValues=expression_attribute_values
-                )
-
-            # Process the items
-            for item in response.get('Items', []):
+        for page in paginator.paginate(
+            TableName=table_name,
+            KeyConditionExpression=key_condition_expression,
+            ExpressionAttributeValues=expression_attribute_values,
+        ):
+            for item in page.get('Items', []):
                 tasks.append({k: list(v.values())[0] for k, v in item.items()})
 
-            # Check if there are more items to fetch
-            last_evaluated_key = response.get('LastEvaluatedKey')
-            if not last_evaluated_key:
-                break
-
         return tasks
 
     except ClientError as e:
@@ -0,0 +1,54 @@
+import boto3
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.exceptions import ClientError
+from typing import Dict, Any, List
+from kptn.util.logger import get_logger
+from .retry_unprocessed import retry_unprocessed
+
+deserializer = TypeDeserializer()
+
+# BatchGetItem accepts at most 100 keys per request
+DDB_MAX_BATCH_GET_SIZE = 100
+
+
+def get_tasks_batch(dynamodb: boto3.client, table_name: str, storage_key: str, pipeline_id: str, task_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Retrieve several tasks from the DynamoDB table with BatchGetItem.
+
+    :param table_name: The name of the DynamoDB table
+    :param storage_key: The branch or desired key name to group task state by
+    :param pipeline_id: The pipeline ID
+    :param task_ids: The task IDs to retrieve
+    :return: A mapping of task ID to task item; tasks that were not found are omitted
+    """
+    logger = get_logger()
+    sk_prefix = f'PIPELINE#{pipeline_id}#TASK#'
+    unique_ids = list(dict.fromkeys(task_ids))
+    tasks: Dict[str, Dict[str, Any]] = {}
+
+    for start in range(0, len(unique_ids), DDB_MAX_BATCH_GET_SIZE):
+        keys = [
+            {
+                'PK': {'S': f'BRANCH#{storage_key}'},
+                'SK': {'S': f'{sk_prefix}{task_id}'},
+            }
+            for task_id in unique_ids[start : start + DDB_MAX_BATCH_GET_SIZE]
+        ]
+        request_items = {table_name: {'Keys': keys}}
+        try:
+            # Throttled keys come back as UnprocessedKeys and must be re-requested with backoff
+            for response in retry_unprocessed(
+                lambda items: dynamodb.batch_get_item(RequestItems=items), request_items, 'UnprocessedKeys'
+            ):
+                for item in response.get('Responses', {}).get(table_name, []):
+                    task = {k: deserializer.deserialize(v) for k, v in item.items()}
+                    task_id = task.get('TaskId') or task['SK'][len(sk_prefix):]
+                    tasks[task_id] = task
+        except ClientError as e:
+            logger.error(f"Error retrieving tasks: {e.response['Error']['Message']}")
+            raise
+
+    missing = [task_id for task_id in unique_ids if task_id not in tasks]
+    if missing:
+        logger.info(f"Tasks not found: storage_key={storage_key}, pipeline_id={pipeline_id}, task_ids={missing} table={table_name}")
+    return tasks
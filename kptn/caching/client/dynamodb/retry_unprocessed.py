@@ -0,0 +1,36 @@
+import time
+from typing import Any, Callable, Dict, Iterator
+from kptn.exceptions import StateStoreError
+
+# Backoff applied between retries of unprocessed requests (doubles each attempt)
+UNPROCESSED_BASE_DELAY = 0.05
+UNPROCESSED_MAX_DELAY = 2.0
+# Give up once a batch still has unprocessed requests after this many calls
+UNPROCESSED_MAX_ATTEMPTS = 10
+
+
+def retry_unprocessed(
+    send: Callable[[Dict[str, Any]], Dict[str, Any]],
+    request_items: Dict[str, Any],
+    unprocessed_key: str,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Send a batch request, re-sending whatever DynamoDB leaves unprocessed with capped exponential backoff.
+
+    :param send: Issues one BatchGetItem/BatchWriteItem call for the given RequestItems
+    :param request_items: The initial RequestItems
+    :param unprocessed_key: The response key holding leftover requests ('UnprocessedKeys' or 'UnprocessedItems')
+    :return: An iterator over every response, so callers can collect returned items
+    :raises StateStoreError: If requests are still unprocessed after UNPROCESSED_MAX_ATTEMPTS calls
+    """
+    delay = UNPROCESSED_BASE_DELAY
+    for attempt in range(1, UNPROCESSED_MAX_ATTEMPTS + 1):
+        response = send(request_items)
+        yield response
+        request_items = response.get(unprocessed_key)
+        if not request_items:
+            return
+        if attempt < UNPROCESSED_MAX_ATTEMPTS:
+            time.sleep(delay)
+            delay = min(delay * 2, UNPROCESSED_MAX_DELAY)
+    raise StateStoreError(f"DynamoDB left requests in {unprocessed_key} after {UNPROCESSED_MAX_ATTEMPTS} attempts")
@@ -1,9 +1,7 @@
 import boto3
-from boto3.dynamodb.types import TypeDeserializer
 from botocore.exceptions import ClientError
 from typing import Dict, Any
-
-deserializer = TypeDeserializer()
+from kptn.util.logger import get_logger
 
 def set_time_in_subitem_in_bin(
     dynamodb: boto3.client,
@@ -31,7 +29,7 @@ def set_time_in_subitem_in_bin(
     :param time_value: The time value to set
     :param hash: Optional hash to set on field `outputHash` if provided
 
-    :return: The response from DynamoDB
+    :return: The response from DynamoDB (without the updated bin; it is not read back)
     """
 
     # Construct the primary key
@@ -49,20 +47,18 @@ def set_time_in_subitem_in_bin(
         update_expression += f", #items[{index}].outputHash = :hash"
         expression_attribute_values[":hash"] = {"S": hash}
 
-    print("Update expression:", update_expression, "Attribute values:", expression_attribute_values, "Key:", key)
+    get_logger().debug(f"Update expression: {update_expression}, Attribute values: {expression_attribute_values}, Key: {key}")
     try:
-        response = dynamodb.update_item(
+        # A bin holds up to BIN_SIZE subtasks, so returning and deserializing the
+        # whole updated item on every subtask start/end is wasted transfer and CPU
+        return dynamodb.update_item(
             TableName=table_name,
             Key=key,
             UpdateExpression=update_expression,
             ExpressionAttributeNames=expression_attribute_names,
             ExpressionAttributeValues=expression_attribute_values,
-            ReturnValues="ALL_NEW",
+            ReturnValues="NONE",
         )
-        # Convert the DynamoDB item to a Python dictionary
-        item = {k: deserializer.deserialize(v) for k, v in response["Attributes"].items()}
-
-        return item
     except ClientError as e:
         print(f"Error updating subtask in bin: {e.response['Error']['Message']}")
         raise
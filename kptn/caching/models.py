@@ -1,3 +1,4 @@
+import os
 from pydantic import BaseModel, TypeAdapter, computed_field
 from typing import Any, Optional
 from kptn.util.hash import hash_obj
@@ -42,3 +43,13 @@ class Subtask(BaseModel):
 
 subtaskAdapter = TypeAdapter(Subtask)
 subtasksAdapter = TypeAdapter(list[Subtask])
+
+# Set KPTN_VALIDATE_SUBTASKS=1 to run full validation on subtasks read back from the cache
+_VALIDATE_SUBTASKS = os.getenv("KPTN_VALIDATE_SUBTASKS") == "1"
+
+def construct_subtasks(items: list[dict[str, Any]]) -> list[Subtask]:
+    """Build Subtasks from items written by our own cache, skipping pydantic validation."""
+    if _VALIDATE_SUBTASKS:
+        return subtasksAdapter.validate_python(items)
+    construct = Subtask.model_construct
+    return [construct(**{**item, "i": int(item["i"])}) for item in items]
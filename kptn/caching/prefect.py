@@ -1,9 +1,10 @@
 from kptn.caching.models import Subtask
 from kptn.caching.TaskStateCache import TaskStateCache
-from kptn.caching.TSCacheUtils import fetch_cached_dep_data, get_task_partial, run_single_task
+from kptn.caching.TSCacheUtils import fetch_cached_dep_data, get_task_partial, run_single_task, split_data_args, summarize_success
+from kptn.util.flow_type import current_flow_run_name
 from kptn.util.logger import get_logger
 from kptn.util.pipeline_config import PipelineConfig
-from kptn.util.hash import hash_obj
+from kptn.util.hash import hash_obj_iter
 from datetime import datetime
 import functools
 import os
@@ -13,32 +14,18 @@ from tasks.settings import load_custom_flow_params
 
 def check_overall_status(statuses):
     """Determine the overall status of a list of statuses"""
-    total = len(statuses)
-    success = sum(status == "SUCCESS" for status in statuses)
-    if success == total:
-        return "SUCCESS"
-    elif success == 0:
-        return "FAILURE"
-    else:
-        return "INCOMPLETE"
+    return summarize_success(status == "SUCCESS" for status in statuses)
 
 def check_futures_success(futures):
     """Determines if all, some, or no elements in a list of futures are successful"""
-    total = len(futures)
-    success = sum(future.get_state().is_completed() for future in futures)
-    if success == total:
-        return "SUCCESS"
-    elif success == 0:
-        return "FAILURE"
-    else:
-        return "INCOMPLETE"
+    # Lazily fetch each future's state once; stop as soon as the outcome is mixed
+    return summarize_success(future.get_state().is_completed() for future in futures)
 
 def fetch_and_hash_subtasks(tscache: TaskStateCache, task_name: str) -> str:
     # Fetch subtasks, get subtask.outputHash for each
     subtasks: list[Subtask] = tscache.db_client.get_subtasks(task_name)
     start = time.time()
-    output_hashes = [subtask.outputHash for subtask in subtasks]
-    outputs_version = hash_obj(output_hashes) if output_hashes else None
+    outputs_version = hash_obj_iter(subtask.outputHash for subtask in subtasks) if subtasks else None
     tscache.logger.info(f"Composite hash took {time.time() - start} seconds")
     return outputs_version
 
@@ -47,7 +34,7 @@ def map_flow(
     pipeline_config: PipelineConfig, task_name: str, **kwargs
 ):
     """Maps an R script over its data_args (dependency data)"""
-    tscache = TaskStateCache(pipeline_config)
+    tscache = TaskStateCache.get_instance(pipeline_config)
     task_obj = tscache.get_task(task_name)
     data_args, value_list, _ = fetch_cached_dep_data(tscache, task_name)
     tscache.set_initial_state(task_name)
@@ -62,29 +49,22 @@ def map_flow(
             incomplete_subtasks = [subtask for subtask in subtasks if not subtask.endTime]
             tscache.logger.info(f"Subtasks found for {task_name}; Incomplete subtasks: {len(incomplete_subtasks)}")
             data_args["idx"] = [subtask.i for subtask in incomplete_subtasks]
-            map_over_key = tscache.get_map_over_key(task_name)
+            keys = tscache.get_map_over_keys(task_name)
             # If the task is mapped over multiple keys, assign each to data_args
-            if "," in map_over_key:
-                keys = map_over_key.split(",")
-                tscache.logger.info(f"map_over_keys: {keys}")
+            if len(keys) > 1:
+                tscache.logger.info(f"map_over_keys: {list(keys)}")
+                split_keys = [subtask.key.split(",") for subtask in incomplete_subtasks]
                 for i, key in enumerate(keys):
-                    data_args[key] = [subtask.key.split(",")[i] for subtask in incomplete_subtasks]
+                    data_args[key] = [parts[i] for parts in split_keys]
                     tscache.logger.info(f"Setting {key} to {data_args[key]}")
             else:
+                map_over_key = keys[0]
                 data_args[map_over_key] = [subtask.key for subtask in incomplete_subtasks]
                 tscache.logger.info(f"Setting {map_over_key} to {data_args[map_over_key]}")
         else:
             tscache.logger.info(f"Creating fresh subtasks for {task_name}")
             tscache.db_client.create_subtasks(task_name, value_list)
 
-    def split_data_args(data_args: dict[str, list], size:int=10) -> list[dict[str, list]]:
-        """
-        Transform a data_args dictionary into a list of dictionaries with `size` elements
-        e.g. if size = 5
-        {"idx": [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]} -> [{"idx": [1, 2, 3, 4, 5]}, {"idx": [6, 7, 8, 9, 10]}]
-        """
-        return [{key: data_args[key][i:i+size] for key in data_args} for i in range(0, len(data_args["idx"]), size)]
-
     def split_data_args_groups(data_args: dict[str, list], size:int=10) -> list[dict[str, list]]|list[list[dict[str, list]]]:
         """
         If input is a regular data_args dictionary, split it into groups of size elements;
@@ -159,7 +139,7 @@ def run_task_prefect(
     pipeline_config: PipelineConfig, task_name: str, reason: str = ""
 ):
     """Runs a pipeline task in its own container"""
-    tscache = TaskStateCache(pipeline_config)
+    tscache = TaskStateCache.get_instance(pipeline_config)
     task_obj = tscache.get_task(task_name)
     # Keep the cache if subset mode or the task is an incomplete mapped task
     if pipeline_config.SUBSET_MODE:
@@ -183,7 +163,7 @@ def run_task_prefect(
         }
         dask_params.update(tscache.get_task_dask_worker_vars(task_name))
         custom_flow_params = load_custom_flow_params(**dask_params)
-        map_flow_run_name = f"{prefect.runtime.flow_run.name}-MapFlow-{datetime.now().strftime('%H:%M:%S')}"
+        map_flow_run_name = f"{current_flow_run_name()}-MapFlow-{datetime.now():%H:%M:%S}"
         subflow = map_flow.with_options(**custom_flow_params, flow_run_name=map_flow_run_name)
         try:
             subflow(pipeline_config, task_name, **kwargs)
@@ -207,7 +187,7 @@ def run_deployment_task(deployment_name: str, task_name: str, pipeline_config: P
     flow_run = run_deployment(
         name=deployment_name,
         # task_name-flow_name-hh:mm:ss
-        flow_run_name=f"{task_name}-{prefect.runtime.flow_run.name}-{datetime.now().strftime('%H:%M:%S')}",
+        flow_run_name=f"{task_name}-{current_flow_run_name()}-{datetime.now():%H:%M:%S}",
         as_subflow=False,
         parameters={
             "pipeline_config": pipeline_config.model_dump(),
@@ -143,7 +143,13 @@ def hash_r_files(file_paths: list[Path], base_dir: str) -> str:
     """
     Given the file path of an R script, return a hash of the contents of the file and all files it imports.
     """
-    abs_file_list = get_file_list(file_paths)
+    return hash_r_file_list(get_file_list(file_paths), base_dir)
+
+
+def hash_r_file_list(abs_file_list: list[str], base_dir: str) -> list[dict[str, str]]:
+    """
+    Hash an already-resolved list of R files, keyed by their path relative to base_dir.
+    """
     file_hashes_list = [
         { path.relpath(file, base_dir): hash_obj(read_r_file(file)) } for file in abs_file_list
     ]
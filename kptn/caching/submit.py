@@ -4,7 +4,7 @@ from kptn.util.pipeline_config import PipelineConfig
 from typing import Union, Tuple
 
 # Type alias for submit configuration tuple: (pipeline_config, task_list, ignore_cache)
-SubmitConfig = Tuple[PipelineConfig, set[str], bool]
+SubmitConfig = Tuple[PipelineConfig, frozenset[str] | set[str], bool]
 
 
 def _prefect_check_cache(
@@ -27,7 +27,7 @@ def _prefect_check_cache(
         parameters: dict,
     ):
         """Checks if task is cached and triggers flow deployment if not cached"""
-        tscache = TaskStateCache(pipeline_config)
+        tscache = TaskStateCache.get_instance(pipeline_config)
 
         if tscache.should_call_on_main_flow(task_name):
             return func(pipeline_config, **parameters)
@@ -62,7 +62,7 @@ def check_cache(
             wait_for,
         )
     else:
-        tscache = TaskStateCache(pipeline_config)
+        tscache = TaskStateCache.get_instance(pipeline_config)
         return tscache.submit(task_name, parameters, ignore_cache)
 
 def _submit(
@@ -86,10 +86,4 @@ def _submit(
         )
 
 def submit(task_name: str, config: SubmitConfig):
-    pipeline_config, task_list, ignore_cache = config
-    return _submit(
-        task_name,
-        pipeline_config,
-        task_list,
-        ignore_cache,
-    )
\ No newline at end of file
+    return _submit(task_name, *config)
\ No newline at end of file
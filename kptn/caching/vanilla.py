@@ -11,10 +11,10 @@ Key functions:
 
 from kptn.caching.models import Subtask
 from kptn.caching.TaskStateCache import TaskStateCache
-from kptn.caching.TSCacheUtils import fetch_cached_dep_data, get_task_partial, run_single_task
+from kptn.caching.TSCacheUtils import fetch_cached_dep_data, get_task_partial, run_single_task, split_data_args, summarize_success
 from kptn.util.logger import get_logger
 from kptn.util.pipeline_config import PipelineConfig
-from kptn.util.hash import hash_obj
+from kptn.util.hash import hash_obj_iter
 import functools
 import os
 import time
@@ -23,34 +23,19 @@ from typing import List, Dict, Any
 
 def check_overall_status(statuses: List[str]) -> str:
     """Determine the overall status of a list of statuses"""
-    total = len(statuses)
-    success = sum(status == "SUCCESS" for status in statuses)
-    if success == total:
-        return "SUCCESS"
-    elif success == 0:
-        return "FAILURE"
-    else:
-        return "INCOMPLETE"
+    return summarize_success(status == "SUCCESS" for status in statuses)
 
 
 def check_results_success(results: List[bool]) -> str:
     """Determines if all, some, or no elements in a list of results are successful"""
-    total = len(results)
-    success = sum(results)
-    if success == total:
-        return "SUCCESS"
-    elif success == 0:
-        return "FAILURE"
-    else:
-        return "INCOMPLETE"
+    return summarize_success(results)
 
 
 def fetch_and_hash_subtasks(tscache: TaskStateCache, task_name: str) -> str:
     """Fetch subtasks, get subtask.outputHash for each"""
     subtasks: List[Subtask] = tscache.db_client.get_subtasks(task_name)
     start = time.time()
-    output_hashes = [subtask.outputHash for subtask in subtasks]
-    outputs_version = hash_obj(output_hashes) if output_hashes else None
+    outputs_version = hash_obj_iter(subtask.outputHash for subtask in subtasks) if subtasks else None
     tscache.logger.info(f"Composite hash took {time.time() - start} seconds")
     return outputs_version
 
@@ -61,7 +46,7 @@ def map_task_vanilla(
     **kwargs
 ):
     """Maps a script/function over its data_args (dependency data) sequentially"""
-    tscache = TaskStateCache(pipeline_config)
+    tscache = TaskStateCache.get_instance(pipeline_config)
     task_obj = tscache.get_task(task_name)
     data_args, value_list, _ = fetch_cached_dep_data(tscache, task_name)
     tscache.set_initial_state(task_name)
@@ -77,29 +62,22 @@ def map_task_vanilla(
             incomplete_subtasks = [subtask for subtask in subtasks if not subtask.endTime]
             tscache.logger.info(f"Subtasks found for {task_name}; Incomplete subtasks: {len(incomplete_subtasks)}")
             data_args["idx"] = [subtask.i for subtask in incomplete_subtasks]
-            map_over_key = tscache.get_map_over_key(task_name)
+            keys = tscache.get_map_over_keys(task_name)
             # If the task is mapped over multiple keys, assign each to data_args
-            if "," in map_over_key:
-                keys = map_over_key.split(",")
-                tscache.logger.info(f"map_over_keys: {keys}")
+            if len(keys) > 1:
+                tscache.logger.info(f"map_over_keys: {list(keys)}")
+                split_keys = [subtask.key.split(",") for subtask in incomplete_subtasks]
                 for i, key in enumerate(keys):
-                    data_args[key] = [subtask.key.split(",")[i] for subtask in incomplete_subtasks]
+                    data_args[key] = [parts[i] for parts in split_keys]
                     tscache.logger.info(f"Setting {key} to {data_args[key]}")
             else:
+                map_over_key = keys[0]
                 data_args[map_over_key] = [subtask.key for subtask in incomplete_subtasks]
                 tscache.logger.info(f"Setting {map_over_key} to {data_args[map_over_key]}")
         else:
             tscache.logger.info(f"Creating fresh subtasks for {task_name}")
             tscache.db_client.create_subtasks(task_name, value_list)
 
-    def split_data_args(data_args: Dict[str, List], size: int = 10) -> List[Dict[str, List]]:
-        """
-        Transform a data_args dictionary into a list of dictionaries with `size` elements
-        e.g. if size = 5
-        {"idx": [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]} -> [{"idx": [1, 2, 3, 4, 5]}, {"idx": [6, 7, 8, 9, 10]}]
-        """
-        return [{key: data_args[key][i:i+size] for key in data_args} for i in range(0, len(data_args["idx"]), size)]
-
     def split_data_args_groups(data_args: Dict[str, List], size: int = 10) -> List[Dict[str, List]]:
         """
         If input is a regular data_args dictionary, split it into groups of size elements;
@@ -210,7 +188,7 @@ def run_task_vanilla(
     reason: str = ""
 ):
     """Runs a pipeline task using vanilla Python (no Prefect, sequential execution)"""
-    tscache = TaskStateCache(pipeline_config)
+    tscache = TaskStateCache.get_instance(pipeline_config)
     task_obj = tscache.get_task(task_name)
     is_batch_array_worker = os.getenv("AWS_BATCH_JOB_ARRAY_INDEX") is not None
 
@@ -274,7 +252,7 @@ def run_wrapper_task(
     from datetime import datetime
     from kptn.caching.models import TaskState
 
-    tscache = TaskStateCache(pipeline_config)
+    tscache = TaskStateCache.get_instance(pipeline_config)
     logger = tscache.logger
 
     subtask_should_run = {name: should_run for name, should_run in subtask_decisions}
@@ -2,13 +2,11 @@ import subprocess
 from os import path
 from pathlib import Path
 from typing import Any, Callable, Iterable, Mapping, Optional
-import jinja2
 from jinja2 import TemplateNotFound
 
 from kptn.read_config import read_config
-from kptn.codegen.lib.setup_jinja_env import debug
+from kptn.codegen.lib.setup_jinja_env import get_jinja_env
 from kptn.codegen.lib.stepfunctions import build_stepfunctions_flow_context
-from kptn.util.filepaths import codegen_dir
 from kptn.util.pipeline_config import normalise_dir_setting
 from kptn.util.read_tasks_config import read_tasks_config
 
@@ -250,14 +248,17 @@ def relative_path_from_flows_dir_to_r_tasks_dir(kap_conf, r_tasks_dir_entry: str
     r_tasks_dir = Path(r_tasks_dir_entry)
     return path.relpath(r_tasks_dir, flows_dir)
 
-def _create_environment(flow_type: str) -> jinja2.Environment:
-    templates_path = path.join(codegen_dir, "templates", flow_type)
-    environment = jinja2.Environment(
-        loader=jinja2.FileSystemLoader(templates_path),
-    )
-    environment.filters["debug"] = debug
-    return environment
-
+def _write_if_changed(output_file: str, rendered: str) -> bool:
+    """Write rendered output unless the file already holds it; return whether it was written."""
+    try:
+        with open(output_file) as f:
+            if f.read() == rendered:
+                return False
+    except (FileNotFoundError, UnicodeDecodeError):
+        pass
+    with open(output_file, 'w') as f:
+        f.write(rendered)
+    return True
 
 def generate_files(graph: str = None, emit_vanilla_runner: Optional[bool] = None):
     kap_conf = read_config()["settings"]
@@ -271,7 +272,7 @@ def generate_files(graph: str = None, emit_vanilla_runner: Optional[bool] = None
         flow_type,
         DEFAULT_FLOW_CONFIG,
     )
-    environment = _create_environment(flow_type)
+    environment = get_jinja_env(flow_type)
     tasks_conf_path = "kptn.yaml"
     conf = read_tasks_config(root_dir / tasks_conf_path)
     tasks_dict = conf['tasks']
@@ -348,8 +349,7 @@ def generate_files(graph: str = None, emit_vanilla_runner: Optional[bool] = None
             rendered = f"{state_machine_json}\n"
         flow_extension = flow_config.get('flow_extension', '.py')
         output_file = path.join(flows_dir, f'{graph_name}{flow_extension}')
-        with open(output_file, 'w') as f:
-            f.write(rendered)
+        _write_if_changed(output_file, rendered)
         render_contexts[graph_name] = render_context
 
     # Write run.py file for stepfunctions (once, not per graph)
@@ -363,8 +363,7 @@ def generate_files(graph: str = None, emit_vanilla_runner: Optional[bool] = None
             **run_context
         )
         run_output_file = path.join(flows_dir, 'run.py')
-        with open(run_output_file, 'w') as f:
-            f.write(run_rendered)
+        _write_if_changed(run_output_file, run_rendered)
 
     # Write tasks/__init__.py file
     task_names = list(tasks_dict.keys())
@@ -390,7 +389,7 @@ def generate_files(graph: str = None, emit_vanilla_runner: Optional[bool] = None
 
     if emit_vanilla_runner:
         vanilla_config = FLOW_TYPE_CONFIG["vanilla"]
-        vanilla_environment = _create_environment("vanilla")
+        vanilla_environment = get_jinja_env("vanilla")
         vanilla_flow_template = vanilla_config.get("flow_template")
         vanilla_extension = vanilla_config.get("flow_extension", ".py")
         for graph_name, render_context in render_contexts.items():
@@ -402,5 +401,4 @@ def generate_files(graph: str = None, emit_vanilla_runner: Optional[bool] = None
             vanilla_output_file = path.join(
                 flows_dir, f"{graph_name}{vanilla_extension}"
             )
-            with open(vanilla_output_file, "w") as f:
-                f.write(vanilla_rendered)
+            _write_if_changed(vanilla_output_file, vanilla_rendered)
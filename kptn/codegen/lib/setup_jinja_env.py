@@ -1,5 +1,29 @@
+import functools
+from os import path
+
+import jinja2
+
+from kptn.util.filepaths import codegen_dir
+
 
 def debug(text):
     """Template debug filter; Usage: {{ deps|debug }}"""
     print(text)
-    return ''
\ No newline at end of file
+    return ''
+
+@functools.lru_cache(maxsize=None)
+def get_jinja_env(flow_type: str) -> jinja2.Environment:
+    """Return the shared Jinja environment for a flow type's templates.
+
+    Templates are parsed once per process (packaged templates don't change under a
+    running codegen, so mtimes aren't re-checked) and their compiled bytecode is kept
+    on disk across CLI runs.
+    """
+    templates_path = path.join(codegen_dir, "templates", flow_type)
+    environment = jinja2.Environment(
+        loader=jinja2.FileSystemLoader(templates_path),
+        bytecode_cache=jinja2.FileSystemBytecodeCache(),
+        auto_reload=False,
+    )
+    environment.filters["debug"] = debug
+    return environment
@@ -64,7 +64,7 @@ def build_reverse_index():
     for name, task in tasks_config["tasks"].items():
         # print(name)
         if "py_script" in task:
-            filename = task["py_script"] if type(task["py_script"]) == str else f"{name}.py"
+            filename = task["py_script"] if isinstance(task["py_script"], str) else f"{name}.py"
             try:
                 script_path = h.get_full_py_script_path(name, filename)
                 rel_path = os.path.relpath(script_path, project_root)
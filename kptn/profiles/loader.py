@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import copy
+import functools
 from pathlib import Path
 from typing import Any
 
@@ -9,6 +11,11 @@ from pydantic import ValidationError
 from kptn.exceptions import ProfileError
 from kptn.profiles.schema import KptnConfig, KptnSettings, ProfileSpec
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
 _KNOWN_PROFILE_KEYS = frozenset(
     {"extends", "args", "start_from", "stop_after", "stage_selections", "optional_groups"}
 )
@@ -33,15 +40,24 @@ def _parse_profile_spec(raw: dict[str, Any]) -> ProfileSpec:
     return ProfileSpec(**known, stage_selections=stage_selections, optional_groups=optional_groups)
 
 
+@functools.lru_cache(maxsize=8)
+def _parse_yaml(path: str, mtime_ns: int, size: int) -> Any:
+    """Parse kptn.yaml; keyed on mtime and size so repeated runs skip unchanged files."""
+    with open(path) as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
+
 class ProfileLoader:
     @classmethod
     def load(cls, path: str | Path) -> KptnConfig:
-        if not Path(path).exists():
+        try:
+            stat = Path(path).stat()
+        except FileNotFoundError:
             return KptnConfig()
 
         try:
-            with open(path) as f:
-                raw = yaml.safe_load(f)
+            # Copy the cached parse so callers can't mutate it through the returned config
+            raw = copy.deepcopy(_parse_yaml(str(path), stat.st_mtime_ns, stat.st_size))
         except yaml.YAMLError as e:
             raise ProfileError(f"{path}: YAML parse error: {e}") from e
 
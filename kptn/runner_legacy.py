@@ -5,7 +5,7 @@ import argparse
 
 def parse_and_validate_tasks(
     task_names: str | list[str] | None,
-    valid_tasks: set[str],
+    valid_tasks: set[str] | frozenset[str],
 ) -> list[str]:
     """Parse and validate task names for pipeline execution.
 
@@ -38,8 +38,8 @@ def parse_and_validate_tasks(
     else:
         task_list = list(task_names)
 
-    # Validate task names
-    if task_list:
+    # Validate task names; the common all-valid case is one set operation
+    if task_list and not valid_tasks.issuperset(task_list):
         invalid_tasks = [task for task in task_list if task not in valid_tasks]
         if invalid_tasks:
             raise ValueError(
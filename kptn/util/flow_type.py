@@ -2,3 +2,18 @@ import os
 
 def is_flow_prefect() -> bool:
     return "PREFECT_API_URL" in os.environ
+
+# flow run id -> flow run name; a run's name never changes, and resolving it
+# outside of a flow run context costs a Prefect API round trip
+_flow_run_names: dict[str, str] = {}
+
+def current_flow_run_name() -> str:
+    """Return the name of the current Prefect flow run, resolved once per run."""
+    import prefect
+
+    flow_run_id = prefect.runtime.flow_run.id
+    name = _flow_run_names.get(flow_run_id)
+    if name is None:
+        name = prefect.runtime.flow_run.name
+        _flow_run_names[flow_run_id] = name
+    return name
@@ -1,10 +1,22 @@
 import hashlib
+from typing import Iterable
 
 def hash_file(file_path: str) -> str:
     """Hash the contents of a file using SHA1, return as string."""
     with open(file_path, 'rb', buffering=0) as f:
         return hashlib.file_digest(f, 'sha1').hexdigest()
 
+def hash_obj_iter(items: Iterable) -> str:
+    """Hash a stream of items in one pass; equals hash_obj(list(items))."""
+    digest = hashlib.sha1(b"[")
+    separator = b""
+    for item in items:
+        digest.update(separator)
+        digest.update(repr(item).encode())
+        separator = b", "
+    digest.update(b"]")
+    return digest.hexdigest()
+
 def hash_obj(obj: dict | list | str | bytes | None) -> str | None:
     """Hash an object using SHA1, return as string."""
     if obj is None:
@@ -1,3 +1,5 @@
+import copy
+import functools
 import os
 from enum import Enum
 from pathlib import Path
@@ -8,6 +10,11 @@ from pydantic import BaseModel, computed_field, model_validator
 from kptn.util.filepaths import project_root
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
 
 class StoreType(str, Enum):
     fs = "fs"
@@ -74,17 +81,27 @@ def _read_py_tasks_dir_from_config(tasks_config_path: str) -> list[str]:
         return []
 
 
-def _read_yaml_config(tasks_config_path: str) -> dict[str, Any]:
-    config_path = Path(tasks_config_path)
-    if not config_path.exists():
-        return {}
+@functools.lru_cache(maxsize=32)
+def _load_yaml_config(config_path: str, mtime_ns: int, size: int) -> dict[str, Any]:
+    """Parse a config file; keyed on its mtime and size so edits are picked up."""
     with open(config_path, 'r') as f:
-        config = yaml.safe_load(f) or {}
+        config = yaml.load(f, Loader=_YamlLoader) or {}
     if isinstance(config, Mapping):
         return dict(config)
     return {}
 
 
+def _read_yaml_config(tasks_config_path: str) -> dict[str, Any]:
+    # PipelineConfig reads kptn.yaml from several validators and computed fields
+    # (including on every model_dump), so parse each version of the file once and
+    # hand out deep copies, since callers may mutate nested sections
+    try:
+        stat = Path(tasks_config_path).stat()
+    except OSError:
+        return {}
+    return copy.deepcopy(_load_yaml_config(str(tasks_config_path), stat.st_mtime_ns, stat.st_size))
+
+
 def _read_settings_from_config(tasks_config_path: str) -> dict[str, Any]:
     config = _read_yaml_config(tasks_config_path)
     settings = config.get('settings', {})
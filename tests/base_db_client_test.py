@@ -65,6 +65,16 @@ class BaseDbClientTest(ABC):
         assert isinstance(task.data, list)
         assert len(task.data) == 3000
 
+    def test_get_tasks_batch(self, db):
+        """Test fetching several tasks at once, skipping missing ones."""
+        db.create_task("A", TaskState(start_time='1'), data=[1, 2, 3])
+        db.create_task("B", TaskState(start_time='2'))
+        tasks = db.get_tasks_batch(["A", "B", "missing"], include_data=True)
+        assert set(tasks) == {"A", "B"}
+        assert tasks["A"].start_time == '1'
+        assert tasks["A"].data == [1, 2, 3]
+        assert tasks["B"].start_time == '2'
+
     def test_set_subtask_started(self, db):
         """Test setting a subtask as started."""
         db.create_task("A", TaskState(start_time='3'))
@@ -1,7 +1,8 @@
 """In-memory fakes for testing cross-component boundaries.
 
-These fakes implement the StateStoreBackend Protocol using in-memory data
-structures, allowing tests to avoid real SQLite or DuckDB backends.
+These fakes implement the StateStoreBackend Protocol and the subset of the
+DynamoDB client API used by kptn using in-memory data structures, allowing
+tests to avoid real SQLite, DuckDB, or DynamoDB backends.
 """
 
 
@@ -22,3 +23,65 @@ class FakeStateStore:
 
     def list_tasks(self, storage_key: str, pipeline: str) -> list[str]:
         return [t for (sk, p, t) in self._store if sk == storage_key and p == pipeline]
+
+
+class FakeDynamoDBClient:
+    """In-memory stand-in for the low-level boto3 DynamoDB client.
+
+    Items are stored in attribute-value form keyed by (PK, SK); every call is
+    recorded in ``calls``. ``unprocessed`` holds the number of upcoming batch
+    calls that should hand their whole request back as unprocessed.
+    """
+
+    def __init__(self) -> None:
+        self.items: dict[tuple[str, str], dict] = {}
+        self.calls: list[tuple[str, dict]] = []
+        self.unprocessed = 0
+
+    @staticmethod
+    def _key(key: dict) -> tuple[str, str]:
+        return key["PK"]["S"], key["SK"]["S"]
+
+    def _throttle(self) -> bool:
+        if self.unprocessed:
+            self.unprocessed -= 1
+            return True
+        return False
+
+    def get_item(self, TableName: str, Key: dict) -> dict:
+        self.calls.append(("get_item", Key))
+        item = self.items.get(self._key(Key))
+        return {"Item": item} if item is not None else {}
+
+    def put_item(self, TableName: str, Item: dict, **kwargs) -> dict:
+        self.calls.append(("put_item", Item))
+        self.items[self._key(Item)] = Item
+        return {}
+
+    def delete_item(self, TableName: str, Key: dict) -> dict:
+        self.calls.append(("delete_item", Key))
+        self.items.pop(self._key(Key), None)
+        return {}
+
+    def batch_write_item(self, RequestItems: dict) -> dict:
+        self.calls.append(("batch_write_item", RequestItems))
+        if self._throttle():
+            return {"UnprocessedItems": RequestItems}
+        for requests in RequestItems.values():
+            for request in requests:
+                if "PutRequest" in request:
+                    item = request["PutRequest"]["Item"]
+                    self.items[self._key(item)] = item
+                else:
+                    self.items.pop(self._key(request["DeleteRequest"]["Key"]), None)
+        return {"UnprocessedItems": {}}
+
+    def batch_get_item(self, RequestItems: dict) -> dict:
+        self.calls.append(("batch_get_item", RequestItems))
+        if self._throttle():
+            return {"Responses": {}, "UnprocessedKeys": RequestItems}
+        responses = {
+            table: [self.items[self._key(key)] for key in request["Keys"] if self._key(key) in self.items]
+            for table, request in RequestItems.items()
+        }
+        return {"Responses": responses, "UnprocessedKeys": {}}
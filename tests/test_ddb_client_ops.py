@@ -0,0 +1,187 @@
+import json
+
+import pytest
+
+pytest.importorskip("boto3")
+
+from kptn.caching.client import DbClientDDB as ddb_module
+from kptn.caching.client.DbClientDDB import DbClientDDB
+from kptn.caching.client.dynamodb import (
+    batch_put_items,
+    batch_write_requests,
+    build_taskdatabin_item,
+    get_taskdatabins,
+    get_tasks_batch,
+)
+from kptn.caching.client.dynamodb import retry_unprocessed as retry_module
+from kptn.caching.client.dynamodb.create_taskdatabin import COMPRESS_MIN_BYTES, COMPRESSED_BIN_CODEC
+from kptn.exceptions import StateStoreError
+from tests.fakes import FakeDynamoDBClient
+
+TABLE = "tasks"
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays: list[float] = []
+    monkeypatch.setattr(retry_module.time, "sleep", delays.append)
+    return delays
+
+
+@pytest.fixture
+def db(monkeypatch):
+    client = FakeDynamoDBClient()
+    monkeypatch.setattr(ddb_module, "get_dynamodb_client", lambda region=None, aws_auth=None: client)
+    return DbClientDDB(table_name=TABLE, storage_key="main", pipeline="pipe")
+
+
+def _put_request(i: int) -> dict:
+    return {"PutRequest": {"Item": {"PK": {"S": f"PK#{i}"}, "SK": {"S": "BIN#0"}}}}
+
+
+def test_batch_write_requests_are_chunked_by_25():
+    client = FakeDynamoDBClient()
+
+    batch_write_requests(client, TABLE, [_put_request(i) for i in range(60)])
+
+    sizes = [len(request[TABLE]) for name, request in client.calls]
+    assert sizes == [25, 25, 10]
+    assert len(client.items) == 60
+
+
+def test_unprocessed_items_are_retried_with_backoff(sleeps):
+    client = FakeDynamoDBClient()
+    client.unprocessed = 3
+
+    batch_put_items(client, TABLE, [_put_request(i)["PutRequest"]["Item"] for i in range(5)])
+
+    assert len(client.calls) == 4
+    assert len(client.items) == 5
+    assert sleeps == [0.05, 0.1, 0.2]
+
+
+def test_unprocessed_retries_are_bounded(sleeps):
+    client = FakeDynamoDBClient()
+    client.unprocessed = retry_module.UNPROCESSED_MAX_ATTEMPTS
+
+    with pytest.raises(StateStoreError):
+        batch_write_requests(client, TABLE, [_put_request(0)])
+
+    assert len(client.calls) == retry_module.UNPROCESSED_MAX_ATTEMPTS
+    assert len(sleeps) == retry_module.UNPROCESSED_MAX_ATTEMPTS - 1
+    assert max(sleeps) == retry_module.UNPROCESSED_MAX_DELAY
+
+
+def test_unprocessed_keys_are_retried_when_reading_tasks(sleeps):
+    client = FakeDynamoDBClient()
+    client.items[("BRANCH#main", "PIPELINE#pipe#TASK#a")] = {
+        "PK": {"S": "BRANCH#main"},
+        "SK": {"S": "PIPELINE#pipe#TASK#a"},
+        "status": {"S": "SUCCESS"},
+    }
+    client.unprocessed = 1
+
+    tasks = get_tasks_batch(client, TABLE, "main", "pipe", ["a", "b"])
+
+    assert tasks["a"]["status"] == "SUCCESS"
+    assert "b" not in tasks
+    assert sleeps == [0.05]
+
+
+def test_small_bins_are_stored_as_json_text():
+    data = ["x"] * 10
+    item = build_taskdatabin_item("main", "pipe", "a", "TASKDATABIN", "0", data)
+
+    assert item["data"] == {"S": json.dumps(data)}
+    assert "codec" not in item
+
+
+def test_compression_threshold():
+    # json.dumps({"k": "x" * n}) is n + 9 characters long
+    below = build_taskdatabin_item("main", "pipe", "a", "TASKDATABIN", "0", {"k": "x" * (COMPRESS_MIN_BYTES - 10)})
+    at = build_taskdatabin_item("main", "pipe", "a", "TASKDATABIN", "0", {"k": "x" * (COMPRESS_MIN_BYTES - 9)})
+
+    assert len(below["data"]["S"]) == COMPRESS_MIN_BYTES - 1
+    assert "codec" not in below
+    assert "B" in at["data"]
+    assert at["codec"] == {"S": COMPRESSED_BIN_CODEC}
+
+
+def test_compressed_bins_round_trip():
+    client = FakeDynamoDBClient()
+    data = [{"id": i, "name": f"row-{i}"} for i in range(500)]
+    small = [1, 2, 3]
+    batch_put_items(client, TABLE, [
+        build_taskdatabin_item("main", "pipe", "a", "TASKDATABIN", "0", data),
+        build_taskdatabin_item("main", "pipe", "a", "TASKDATABIN", "1", small),
+    ])
+
+    bins = get_taskdatabins(client, TABLE, "main", "pipe", "a", ["0", "1"])
+
+    assert [json.loads(b["data"]) for b in bins] == [data, small]
+    assert "codec" in bins[0] and "codec" not in bins[1]
+
+
+def test_task_items_are_cached_until_ttl_or_invalidation(db):
+    key = ("BRANCH#main", "PIPELINE#pipe#TASK#a")
+    db.client.items[key] = {"PK": {"S": key[0]}, "SK": {"S": key[1]}, "status": {"S": "SUCCESS"}}
+
+    def reads():
+        return sum(1 for name, _ in db.client.calls if name == "get_item")
+
+    assert db.get_task("a").status == "SUCCESS"
+    assert db.get_task("a").status == "SUCCESS"
+    assert reads() == 1
+
+    read_at, item = db._task_items["a"]
+    db._task_items["a"] = (read_at - ddb_module.TASK_CACHE_TTL, item)
+    db.get_task("a")
+    assert reads() == 2
+
+    db.client.items[key]["status"] = {"S": "FAILURE"}
+    db.invalidate("a")
+    assert db.get_task("a").status == "FAILURE"
+    assert reads() == 3
+
+
+def test_delete_task_fans_out_over_every_bin_type(db):
+    key = ("BRANCH#main", "PIPELINE#pipe#TASK#a")
+    db.client.items[key] = {
+        "PK": {"S": key[0]},
+        "SK": {"S": key[1]},
+        "taskdata_count": {"N": "12000"},
+        "subtask_count": {"N": "600"},
+    }
+    db.get_task("a")
+
+    db.delete_task("a")
+
+    deleted = [
+        request["DeleteRequest"]["Key"]["PK"]["S"]
+        for name, request_items in db.client.calls
+        if name == "batch_write_item"
+        for request in request_items[TABLE]
+    ]
+    prefix = "BRANCH#main#PIPELINE#pipe#TASK#a#"
+    expected = (
+        [f"{prefix}SUBTASKBIN#{i}" for i in range(2)]
+        + [f"{prefix}TASKDATABIN#{i}" for i in range(25)]
+        + [f"{prefix}SUBSETBIN#0"]
+    )
+    assert sorted(deleted) == sorted(expected)
+    write_sizes = [len(r[TABLE]) for name, r in db.client.calls if name == "batch_write_item"]
+    assert sorted(write_sizes) == [3, 25]
+    assert db.client.calls[-1][0] == "delete_item"
+    assert key not in db.client.items
+    assert "a" not in db._task_items
+
+
+def test_subset_mode_falls_back_to_task_data(db):
+    key = ("BRANCH#main", "PIPELINE#pipe#TASK#a")
+    db.client.items[key] = {"PK": {"S": key[0]}, "SK": {"S": key[1]}, "taskdata_count": {"N": "2"}}
+    db.create_taskdata("a", [1, 2], "TASKDATABIN")
+
+    assert db.get_task("a", include_data=True, subset_mode=True).data == [1, 2]
+
+    db.create_taskdata("a", [2], "SUBSETBIN")
+    assert db.get_task("a", include_data=True, subset_mode=True).data == [2]
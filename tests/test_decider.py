@@ -182,3 +182,17 @@ def test_decider_merges_state_payload(mock_pipeline_config_path, patch_code_hash
     response = decide_task_execution(event=event, db_client=FakeDbClient())
     assert response["task_name"] == "A"
     assert response["should_run"] is True
+
+
+def test_decider_releases_dep_states_it_read(mock_pipeline_config_path, patch_code_hashes):
+    event = {
+        "TASKS_CONFIG_PATH": mock_pipeline_config_path,
+        "PIPELINE_NAME": "sample",
+        "task_name": "B",
+    }
+    response = decide_task_execution(
+        event=event,
+        db_client=FakeDbClient({"A": build_task_state()}),
+    )
+    assert response["should_run"] is True
+    assert TaskStateCache._instance._dep_states_cache == {}
@@ -3,6 +3,7 @@ from pathlib import Path
 import shutil
 import pytest
 from kptn.caching.Hasher import Hasher
+from kptn.util.hash import hash_obj, hash_obj_iter
 from tests.fixture_constants import mock_dir, tasks_yaml_path
 
 # The nibrs example is a real-world pipeline kept local-only (gitignored), so
@@ -113,3 +114,74 @@ def test_py_function_dependency_hashing(tmp_path):
     functions = {item["function"] for item in hashes}
     assert "task.task" in functions
     assert "helper.helper" in functions
+
+
+def test_py_code_hashes_memoized_until_dependency_changes(tmp_path):
+    pkg_root = tmp_path / "tasks"
+    pkg_root.mkdir()
+    (pkg_root / "__init__.py").write_text("")
+    helper_path = pkg_root / "helper.py"
+    helper_path.write_text("def helper() -> int:\n    return 41\n")
+    (pkg_root / "task.py").write_text(
+        "from .helper import helper\n\n"
+        "def task() -> int:\n    return helper() + 1\n"
+    )
+    tasks_config = {"tasks": {"task": {"py_script": "task.py"}}}
+    hasher = Hasher(py_dirs=[str(pkg_root)], tasks_config=tasks_config)
+
+    first = hasher.build_py_code_hashes("task", tasks_config["tasks"]["task"])
+    assert hasher.build_py_code_hashes("task", tasks_config["tasks"]["task"]) is first
+
+    helper_path.write_text("def helper() -> int:\n    return 40 + 2\n")
+    stat = helper_path.stat()
+    os.utime(helper_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    second = hasher.build_py_code_hashes("task", tasks_config["tasks"]["task"])
+    assert second is not first
+    assert second != first
+
+
+def test_module_summary_source_segments_match_ast():
+    import ast
+
+    from kptn.caching.Hasher import ModuleSummary
+
+    source = (
+        "x = 'caf\u00e9'\r\n"
+        "class A:\n"
+        "    def f(self):  # \f form feed\n"
+        "        return 'na\u00efve', x\r"
+        "async def g(): return A().f()\n"
+    )
+    tree = ast.parse(source)
+    summary = ModuleSummary(Path("mod.py"), "mod", source, tree)
+    for node in ast.walk(tree):
+        if hasattr(node, "end_lineno"):
+            assert summary.get_source_segment(node) == ast.get_source_segment(source, node)
+
+
+def test_module_path_lookups_cached_until_forget(tmp_path):
+    from kptn.caching.Hasher import PythonFunctionAnalyzer
+
+    pkg_root = tmp_path / "tasks"
+    pkg_root.mkdir()
+    task_path = pkg_root / "task.py"
+    task_path.write_text("import helper\n\ndef task():\n    return helper.helper()\n")
+    analyzer = PythonFunctionAnalyzer(py_dirs=[str(pkg_root)])
+
+    first = analyzer.build_function_hashes(task_path, "task")
+    assert [item["function"] for item in first] == ["task.task"]
+
+    # The miss is remembered, so a module added later isn't seen until files change
+    (pkg_root / "helper.py").write_text("def helper():\n    return 1\n")
+    assert analyzer.build_function_hashes(task_path, "task") == first
+
+    analyzer.forget([task_path])
+    functions = {item["function"] for item in analyzer.build_function_hashes(task_path, "task")}
+    assert functions == {"task.task", "helper.helper"}
+
+
+def test_hash_obj_iter_matches_hash_obj_of_list():
+    items = ["abc", None, "d'e"]
+    assert hash_obj_iter(iter(items)) == hash_obj(items)
+    assert hash_obj_iter([]) == hash_obj([])
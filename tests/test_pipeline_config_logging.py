@@ -49,3 +49,42 @@ def test_pipeline_config_returns_none_when_runtime_log_file_is_unset(tmp_path):
     pipeline_config = PipelineConfig(TASKS_CONFIG_PATH=str(config_path), PIPELINE_NAME="demo")
 
     assert pipeline_config.runtime_log_file is None
+
+
+def test_pipeline_config_parses_kptn_yaml_once_per_version(tmp_path, monkeypatch):
+    import os
+
+    from kptn.util import pipeline_config as pipeline_config_module
+
+    config_path = tmp_path / "kptn.yaml"
+    config_path.write_text("graphs:\n  demo:\n    tasks: {}\n", encoding="utf-8")
+    loads = []
+    original_load = pipeline_config_module.yaml.load
+
+    def counting_load(*args, **kwargs):
+        loads.append(1)
+        return original_load(*args, **kwargs)
+
+    monkeypatch.setattr(pipeline_config_module.yaml, "load", counting_load)
+
+    first = PipelineConfig(TASKS_CONFIG_PATH=str(config_path))
+    assert first.runtime_log_file is None
+    assert PipelineConfig(TASKS_CONFIG_PATH=str(config_path)).runtime_log_file is None
+    assert first.PIPELINE_NAME == "demo"
+    assert len(loads) == 1
+
+    config_path.write_text("graphs:\n  renamed:\n    tasks: {}\n", encoding="utf-8")
+    stat = config_path.stat()
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert PipelineConfig(TASKS_CONFIG_PATH=str(config_path)).PIPELINE_NAME == "renamed"
+
+
+def test_pipeline_config_yaml_reads_do_not_share_nested_sections(tmp_path):
+    from kptn.util.pipeline_config import _read_yaml_config
+
+    config_path = tmp_path / "kptn.yaml"
+    config_path.write_text("graphs:\n  demo:\n    tasks: {}\n", encoding="utf-8")
+
+    _read_yaml_config(str(config_path))["graphs"]["demo"]["tasks"]["extra"] = None
+
+    assert _read_yaml_config(str(config_path))["graphs"]["demo"]["tasks"] == {}
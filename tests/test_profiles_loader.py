@@ -113,3 +113,39 @@ def test_load_null_profile_entry_raises_profile_error(tmp_path):
     with pytest.raises(ProfileError) as exc_info:
         ProfileLoader.load(kptn_yaml)
     assert "profiles.dev" in str(exc_info.value)
+
+
+def test_load_parses_kptn_yaml_once_per_version(tmp_path, monkeypatch):
+    import os
+
+    from kptn.profiles import loader as loader_module
+
+    kptn_yaml = tmp_path / "kptn.yaml"
+    kptn_yaml.write_text("settings:\n  db: sqlite\n")
+    loads = []
+    original_load = loader_module.yaml.load
+
+    def counting_load(*args, **kwargs):
+        loads.append(1)
+        return original_load(*args, **kwargs)
+
+    monkeypatch.setattr(loader_module.yaml, "load", counting_load)
+
+    assert ProfileLoader.load(kptn_yaml).settings.db == "sqlite"
+    assert ProfileLoader.load(kptn_yaml).settings.db == "sqlite"
+    assert len(loads) == 1
+
+    kptn_yaml.write_text("settings:\n  db: duckdb\n")
+    stat = kptn_yaml.stat()
+    os.utime(kptn_yaml, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert ProfileLoader.load(kptn_yaml).settings.db == "duckdb"
+    assert len(loads) == 2
+
+
+def test_load_does_not_share_cached_values(tmp_path):
+    kptn_yaml = tmp_path / "kptn.yaml"
+    kptn_yaml.write_text("profiles:\n  dev:\n    args:\n      task_name:\n        items: [1, 2]\n")
+
+    ProfileLoader.load(kptn_yaml).profiles["dev"].args["task_name"]["items"].append(3)
+
+    assert ProfileLoader.load(kptn_yaml).profiles["dev"].args["task_name"]["items"] == [1, 2]
@@ -24,6 +24,7 @@ def _make_cache() -> TaskStateCache:
         },
         "tasks": {},
     }
+    cache._dep_lists = {}
     return cache
 
 
@@ -60,6 +61,8 @@ def test_graph_task_object_with_args():
         "tasks": {},
     }
 
+    cache._dep_lists = {}
+
     tasks = cache._graph_tasks("pipe")
     assert tasks["a"]["args"] == {"x": 1}
     assert cache.get_dep_list("a") == []
@@ -114,3 +117,12 @@ def test_ordered_pipeline_tasks_is_topological_not_yaml_order():
     }
 
     assert cache._ordered_pipeline_tasks("pipe") == ["a", "b", "c"]
+
+
+def test_dep_list_is_memoized_per_task():
+    cache = _make_cache()
+
+    first = cache.get_dep_list("g")
+    assert first == ["c"]
+    assert cache.get_dep_list("g") is first
+    assert cache._dep_lists == {"g": ["c"]}
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import logging
+import sys
 from types import SimpleNamespace
 from typing import Dict
 
+from kptn.caching.client.DbClientBase import DbClientBase
 from kptn.caching.TaskStateCache import TaskStateCache
-from kptn.caching.models import TaskState
+from kptn.caching.TSCacheUtils import fetch_cached_dep_data
+from kptn.caching.models import Subtask, TaskState, construct_subtasks
+from kptn.util.hash import hash_obj
 
 
 class DummyHasher:
@@ -52,6 +56,9 @@ def _make_cache(tmp_path) -> TaskStateCache:
     cache._duckdb_sql_functions = {}
     cache._python_module_cache = {}
     cache._task_has_prior_runs = {}
+    cache._dep_lists = {}
+    cache._dep_states_cache = {}
+    cache._python_callables = {}
 
     def _noop_build(*args, **kwargs):
         return None, None
@@ -71,3 +78,187 @@ def test_hashing_waits_for_prior_run(tmp_path):
     cache.set_initial_state("alpha")
     cache.set_final_state("alpha")
     assert cache.hasher.called == ["alpha"]
+
+
+def test_dep_states_are_kept_from_evaluation_until_final_state(tmp_path):
+    TaskStateCache._instance = None
+    cache = _make_cache(tmp_path)
+    cache.tasks_config["graphs"]["demo"]["tasks"]["beta"] = ["alpha"]
+    cache.tasks_config["tasks"]["beta"] = {"file": "beta.py"}
+    reads: list[str] = []
+    original_get_task = cache.db_client.get_task
+
+    def counting_get_task(task_name, include_data=False, subset_mode=False):
+        reads.append(task_name)
+        return original_get_task(task_name, include_data, subset_mode)
+
+    cache.db_client.get_task = counting_get_task
+    cache.db_client.state["alpha"] = TaskState(outputs_version="v1")
+
+    decision = cache.evaluate_submission("beta")
+    assert decision.should_run
+    cache.get_dep_states("beta")
+    assert reads == ["beta", "alpha"]
+
+    cache.set_final_state("beta")
+    assert reads == ["beta", "alpha"]
+    cache.get_dep_states("beta")
+    assert reads == ["beta", "alpha", "alpha"]
+
+
+class BatchingDbClient(DbClientBase):
+    states: dict = {}
+    batches: list = []
+
+    def get_tasks_batch(self, task_names, include_data=False, subset_mode=False):
+        self.batches.append(list(task_names))
+        return {name: self.states[name] for name in task_names if name in self.states}
+
+
+def test_task_and_dep_states_are_read_in_one_batch(tmp_path):
+    TaskStateCache._instance = None
+    cache = _make_cache(tmp_path)
+    cache.tasks_config["graphs"]["demo"]["tasks"]["beta"] = ["alpha"]
+    cache.tasks_config["tasks"]["beta"] = {"file": "beta.py"}
+    cache.db_client = BatchingDbClient(
+        states={"alpha": TaskState(outputs_version="v1"), "beta": TaskState(status="SUCCESS")}
+    )
+
+    state = cache.fetch_state_with_dep_states("beta")
+    dep_states = cache.get_dep_states("beta")
+
+    assert state.status == "SUCCESS"
+    assert dep_states == [("alpha", TaskState(outputs_version="v1"))]
+    assert cache.db_client.batches == [["beta", "alpha"]]
+
+
+def test_invalidate_dep_states_tolerates_concurrent_release(tmp_path):
+    TaskStateCache._instance = None
+    cache = _make_cache(tmp_path)
+    cache.tasks_config["graphs"]["demo"]["tasks"]["beta"] = ["alpha"]
+    cache._dep_states_cache["beta"] = [("alpha", None)]
+    original_get_dep_list = cache.get_dep_list
+
+    def releasing_get_dep_list(task_name):
+        # Another task thread releases the entry while invalidation iterates
+        cache.release_dep_states("beta")
+        return original_get_dep_list(task_name)
+
+    cache.get_dep_list = releasing_get_dep_list
+    cache.invalidate_dep_states("alpha")
+    assert cache._dep_states_cache == {}
+
+
+def test_dep_data_reuses_states_read_for_submission(tmp_path):
+    TaskStateCache._instance = None
+    cache = _make_cache(tmp_path)
+    cache.tasks_config["graphs"]["demo"]["tasks"]["beta"] = ["alpha"]
+    cache.tasks_config["tasks"]["beta"] = {"file": "beta.py", "args": {"rows": {"ref": "alpha"}}}
+    cache.db_client.state["alpha"] = TaskState(data=[1, 2])
+    reads: list[str] = []
+    original_get_task = cache.db_client.get_task
+
+    def counting_get_task(task_name, include_data=False, subset_mode=False):
+        reads.append(task_name)
+        return original_get_task(task_name, include_data, subset_mode)
+
+    cache.db_client.get_task = counting_get_task
+    cache.fetch_state_with_dep_states("beta")
+
+    data_args, _, _ = fetch_cached_dep_data(cache, "beta")
+    assert data_args == {"rows": [1, 2]}
+    assert reads == ["beta", "alpha"]
+
+
+def test_dep_data_reads_only_deps_that_cache_results(tmp_path):
+    TaskStateCache._instance = None
+    cache = _make_cache(tmp_path)
+    cache.tasks_config["graphs"]["demo"]["tasks"]["gamma"] = []
+    cache.tasks_config["graphs"]["demo"]["tasks"]["beta"] = ["alpha", "gamma"]
+    cache.tasks_config["tasks"]["gamma"] = {"file": "gamma.py", "outputs": ["bar.txt"]}
+    cache.tasks_config["tasks"]["beta"] = {"file": "beta.py", "args": {"rows": {"ref": "alpha"}}}
+    cache.db_client.state["alpha"] = TaskState(data=[1, 2])
+    cache.db_client.state["gamma"] = TaskState(outputs_version="v1")
+    reads: list[str] = []
+    original_get_task = cache.db_client.get_task
+
+    def counting_get_task(task_name, include_data=False, subset_mode=False):
+        reads.append(task_name)
+        return original_get_task(task_name, include_data, subset_mode)
+
+    cache.db_client.get_task = counting_get_task
+
+    data_args, _, _ = fetch_cached_dep_data(cache, "beta")
+    assert data_args == {"rows": [1, 2]}
+    assert reads == ["alpha"]
+
+
+def test_python_callable_is_resolved_once(tmp_path, monkeypatch):
+    (tmp_path / "alpha_callable_task.py").write_text("def alpha():\n    return 1\n")
+    cache = _make_cache(tmp_path)
+    cache.tasks_config["tasks"]["alpha"]["file"] = "alpha_callable_task.py"
+    monkeypatch.delitem(sys.modules, "alpha_callable_task", raising=False)
+
+    first = cache.get_python_callable("alpha")
+    assert first() == 1
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("module should not be reloaded")
+
+    cache._load_python_module_for_task = _fail
+    assert cache.get_python_callable("alpha") is first
+
+
+def test_submission_code_version_matches_stored_state(tmp_path):
+    TaskStateCache._instance = None
+    cache = _make_cache(tmp_path)
+    code_hashes = [{"function_name": "alpha", "hash": "abc"}]
+
+    def _build(*args, **kwargs):
+        return code_hashes, "Python"
+
+    cache.build_task_code_hashes = _build
+    cache.set_initial_state("alpha")
+    cache.set_final_state("alpha", status="SUCCESS")
+    cache.db_client.state["alpha"].end_time = "done"
+
+    assert cache.db_client.state["alpha"].code_version == hash_obj(code_hashes)
+    decision = cache.evaluate_submission("alpha")
+    assert not decision.should_run
+
+
+def test_submission_without_cached_state_skips_code_digest(tmp_path, monkeypatch):
+    import kptn.caching.TaskStateCache as tscache_module
+
+    TaskStateCache._instance = None
+    cache = _make_cache(tmp_path)
+    cache.build_task_code_hashes = lambda *args, **kwargs: ([{"hash": "abc"}], "Python")
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("code hashes should not be digested without a cached state")
+
+    monkeypatch.setattr(tscache_module, "hash_obj", _fail)
+    decision = cache.evaluate_submission("alpha")
+    assert decision.should_run
+    assert decision.reason == "No cached state"
+
+
+def test_task_state_versions_follow_source_changes():
+    state = TaskState(code_hashes=[{"function_name": "alpha", "hash": "abc"}])
+    version = state.code_version
+    assert state.model_dump()["code_version"] == version
+
+    updated = [{"function_name": "alpha", "hash": "def"}]
+    copied = state.model_copy(update={"code_hashes": updated})
+    assert copied.code_version == hash_obj(updated)
+    assert state.code_version == version
+
+    state.code_hashes[0]["hash"] = "def"
+    assert state.code_version == hash_obj(updated)
+
+
+def test_construct_subtasks_matches_validated_subtasks():
+    items = [{"i": "0", "key": "a", "endTime": "done"}, {"i": "1", "key": "b"}]
+    subtasks = construct_subtasks(items)
+    assert subtasks == [Subtask(i=0, key="a", endTime="done"), Subtask(i=1, key="b")]
+    assert subtasks[1].endTime is None
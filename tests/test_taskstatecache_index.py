@@ -0,0 +1,85 @@
+import pytest
+
+from kptn.caching.TaskStateCache import TaskStateCache
+
+
+def _make_cache(tasks: dict) -> TaskStateCache:
+    cache = object.__new__(TaskStateCache)
+    cache.pipeline_name = "pipe"
+    cache.tasks_config = {"tasks": tasks}
+    cache._dep_lists = {}
+    return cache
+
+
+def test_task_predicates_use_precomputed_index():
+    cache = _make_cache(
+        {
+            "r_task": {"file": "r_task.R", "map_over": "item"},
+            "py_task": {"file": "py_task.py:run", "iterable_item": "item", "cache_result": True},
+            "sql_task": {"file": "sql_task.sql", "main_flow": True},
+        }
+    )
+
+    assert cache.is_rscript("r_task")
+    assert cache.is_mapped_task("r_task")
+    assert cache.is_python_task("py_task")
+    assert cache.task_returns_list("py_task")
+    assert cache.should_cache_result("py_task")
+    assert cache.is_duckdb_sql_task("sql_task")
+    assert cache.should_call_on_main_flow("sql_task")
+    assert not cache.is_mapped_task("sql_task")
+    assert not cache.should_cache_result("r_task")
+
+
+def test_task_index_rebuilds_when_tasks_block_is_replaced():
+    cache = _make_cache({"a": {"file": "a.py"}})
+    assert not cache.is_mapped_task("a")
+
+    cache.tasks_config["tasks"] = {"a": {"file": "a.R", "map_over": "item"}}
+
+    assert cache.is_mapped_task("a")
+    assert cache.is_rscript("a")
+
+
+def test_task_predicates_still_reject_unknown_tasks_and_suffixes():
+    cache = _make_cache({"odd": {"file": "odd.txt"}})
+
+    with pytest.raises(KeyError):
+        cache.is_mapped_task("missing")
+    with pytest.raises(ValueError):
+        cache.is_rscript("odd")
+    assert not cache.is_duckdb_sql_task("odd")
+
+
+def test_map_over_keys_are_split_once():
+    cache = _make_cache(
+        {
+            "single": {"file": "single.py", "map_over": "item"},
+            "multi": {"file": "multi.py", "map_over": "a,b"},
+            "plain": {"file": "plain.py"},
+        }
+    )
+
+    assert cache.get_map_over_keys("multi") == ("a", "b")
+    assert cache.get_map_over_keys("plain") == ()
+    assert cache.get_key_value("single", {"item": "x"}) == "x"
+    assert cache.get_key_value("multi", {"a": 1, "b": 2}) == "1,2"
+    assert cache.get_key_value("multi", {"a": 1}) is None
+    assert cache.get_key_value("plain", {"item": "x"}) is None
+
+
+def test_task_argument_plan_is_memoized_with_index():
+    cache = _make_cache(
+        {
+            "producer": {"file": "producer.py", "cache_result": True},
+            "consumer": {"file": "consumer.py", "args": {"rows": {"ref": "producer"}}},
+        }
+    )
+    cache.tasks_config["graphs"] = {"pipe": {"tasks": {"producer": None, "consumer": "producer"}}}
+
+    plan = cache.get_task_argument_plan("consumer")
+    assert plan.alias_lookup == {"producer": "rows"}
+    assert cache.get_task_argument_plan("consumer") is plan
+
+    cache.tasks_config["tasks"] = dict(cache.tasks_config["tasks"])
+    assert cache.get_task_argument_plan("consumer") is not plan
@@ -116,3 +116,12 @@ def test_taskstatecache_reuses_singleton_instance(monkeypatch, tmp_path):
     assert TaskStateCache._instance is first
     assert build_calls["count"] == 1
     assert restore_calls["count"] == 1
+
+
+def test_get_instance_returns_existing_singleton():
+    existing = object.__new__(TaskStateCache)
+    TaskStateCache._instance = existing
+    try:
+        assert TaskStateCache.get_instance(SimpleNamespace(PIPELINE_NAME="other")) is existing
+    finally:
+        TaskStateCache._instance = None
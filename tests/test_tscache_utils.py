@@ -0,0 +1,101 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from kptn.caching.TSCacheUtils import fetch_cached_dep_data, split_data_args, summarize_success
+from kptn.caching.models import TaskState
+from kptn.util.task_args import build_task_argument_plan
+
+
+def _make_tscache(tasks: dict, deps: dict, states: dict):
+    return SimpleNamespace(
+        tasks_config={"tasks": tasks},
+        logger=logging.getLogger("test"),
+        get_dep_list=lambda name: deps.get(name, []),
+        get_task=lambda name: tasks[name],
+        should_cache_result=lambda name: tasks[name].get("cache_result") is True,
+        get_dep_states=lambda name, dep_names=None: [
+            (dep, states.get(dep)) for dep in (deps.get(name, []) if dep_names is None else dep_names)
+        ],
+        get_task_argument_plan=lambda name: build_task_argument_plan(
+            name, tasks[name], deps.get(name, []), tasks
+        ),
+    )
+
+
+def test_fetch_cached_dep_data_unpacks_multi_key_rows():
+    tasks = {
+        "pairs": {"file": "pairs.py", "cache_result": True, "iterable_item": "a,b"},
+        "consumer": {"file": "consumer.py", "map_over": "a,b"},
+    }
+    tscache = _make_tscache(
+        tasks,
+        {"consumer": ["pairs"]},
+        {"pairs": TaskState(data=[[1, "x"], [2, "y"], [3, "z"]])},
+    )
+
+    data_args, value_list, count = fetch_cached_dep_data(tscache, "consumer")
+
+    assert data_args == {"a": [1, 2, 3], "b": ["x", "y", "z"]}
+    assert value_list == ["1,x", "2,y", "3,z"]
+    assert count == 3
+
+
+def test_fetch_cached_dep_data_handles_empty_multi_key_rows():
+    tasks = {
+        "pairs": {"file": "pairs.py", "cache_result": True, "iterable_item": "a,b"},
+        "consumer": {"file": "consumer.py", "map_over": "a,b"},
+    }
+    tscache = _make_tscache(tasks, {"consumer": ["pairs"]}, {"pairs": TaskState(data=[])})
+
+    data_args, value_list, count = fetch_cached_dep_data(tscache, "consumer")
+
+    assert data_args == {"a": [], "b": []}
+    assert value_list == []
+    assert count == 0
+
+
+def test_summarize_success_stops_at_first_mixed_result():
+    seen = []
+
+    def flags():
+        for flag in (True, False, True):
+            seen.append(flag)
+            yield flag
+
+    assert summarize_success(flags()) == "INCOMPLETE"
+    assert seen == [True, False]
+    assert summarize_success([True, True]) == "SUCCESS"
+    assert summarize_success([False, False]) == "FAILURE"
+    assert summarize_success([]) == "SUCCESS"
+
+
+def test_split_data_args_groups_every_key_together():
+    data_args = {"idx": [0, 1, 2, 3, 4], "item": ["a", "b", "c", "d", "e"]}
+
+    assert split_data_args(data_args, 2) == [
+        {"idx": [0, 1], "item": ["a", "b"]},
+        {"idx": [2, 3], "item": ["c", "d"]},
+        {"idx": [4], "item": ["e"]},
+    ]
+    assert split_data_args({"idx": []}, 2) == []
+
+
+@pytest.mark.parametrize(
+    "rows",
+    [
+        [[1], [2]],
+        [[1, "x", True], [2, "y", False]],
+        [[1, "x"], [2]],
+    ],
+)
+def test_fetch_cached_dep_data_rejects_rows_that_do_not_match_keys(rows):
+    tasks = {
+        "pairs": {"file": "pairs.py", "cache_result": True, "iterable_item": "a,b"},
+        "consumer": {"file": "consumer.py", "map_over": "a,b"},
+    }
+    tscache = _make_tscache(tasks, {"consumer": ["pairs"]}, {"pairs": TaskState(data=rows)})
+
+    with pytest.raises(ValueError):
+        fetch_cached_dep_data(tscache, "consumer")